@@ -0,0 +1,103 @@
+"""
+Adaptive Sampling - Confidence-Interval Early Stopping
+======================================================
+Estimates a success probability by sampling in growing batches and stopping
+as soon as the confidence interval is tight enough, instead of committing to
+a fixed shot count up front.
+"""
+
+import math
+from statistics import NormalDist
+from typing import Callable, Dict, Any, Optional, Tuple
+
+
+def wilson_interval(successes: int, trials: int, confidence: float = 0.95) -> Tuple[float, float]:
+    """Wilson score interval for a binomial proportion
+
+    Unlike the normal approximation it stays inside [0, 1] and behaves well
+    when the estimate is at or near 0 or 1 (e.g. noiseless teleportation).
+    """
+    if trials == 0:
+        return 0.0, 1.0
+
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    p = successes / trials
+    denom = 1 + z * z / trials
+    centre = (p + z * z / (2 * trials)) / denom
+    half = z * math.sqrt(p * (1 - p) / trials + z * z / (4 * trials * trials)) / denom
+    return max(0.0, centre - half), min(1.0, centre + half)
+
+
+def _converged(
+    estimate: float,
+    low: float,
+    high: float,
+    target_width: Optional[float],
+    relative_error: Optional[float]
+) -> bool:
+    """Check the stopping rule against whichever targets were requested"""
+    if target_width is not None and high - low <= target_width:
+        return True
+    if relative_error is not None and estimate > 0:
+        return (high - low) / 2 / estimate <= relative_error
+    return False
+
+
+def adaptive_estimate(
+    sample_batch: Callable[[int, int], int],
+    target_width: Optional[float] = None,
+    relative_error: Optional[float] = None,
+    max_shots: int = 10000,
+    confidence: float = 0.95,
+    initial_batch: int = 64,
+    growth: float = 2.0
+) -> Dict[str, Any]:
+    """Sample in geometrically growing batches until the estimate converges
+
+    sample_batch(shots, batch_index) runs `shots` shots and returns how many
+    of them succeeded. Sampling stops when the interval width drops below
+    `target_width`, the relative half-width drops below `relative_error`,
+    or `max_shots` is spent.
+    """
+    if target_width is None and relative_error is None:
+        raise ValueError("Provide target_width and/or relative_error")
+    if max_shots < 1:
+        raise ValueError("max_shots must be a positive integer")
+    if not 0 < confidence < 1:
+        raise ValueError("confidence must be between 0 and 1")
+    if target_width is not None and not target_width > 0:
+        raise ValueError("target_width must be positive")
+    if relative_error is not None and not relative_error > 0:
+        raise ValueError("relative_error must be positive")
+
+    successes = 0
+    trials = 0
+    batches = 0
+    batch_size = max(1, initial_batch)
+    converged = False
+    low, high = 0.0, 1.0
+
+    while trials < max_shots:
+        shots = min(batch_size, max_shots - trials)
+        successes += sample_batch(shots, batches)
+        trials += shots
+        batches += 1
+
+        estimate = successes / trials
+        low, high = wilson_interval(successes, trials, confidence)
+        if _converged(estimate, low, high, target_width, relative_error):
+            converged = True
+            break
+
+        batch_size = int(math.ceil(batch_size * growth))
+
+    return {
+        "estimate": successes / trials,
+        "confidence_interval": [low, high],
+        "interval_width": high - low,
+        "confidence": confidence,
+        "shots_used": trials,
+        "successes": successes,
+        "batches": batches,
+        "converged": converged,
+    }
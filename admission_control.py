@@ -0,0 +1,249 @@
+"""
+Admission Control - Cost-Based Limits and Fair Scheduling
+=========================================================
+Protects the shared Q# simulator from being monopolised by one client.
+
+Every request is priced up front from its qubit count, circuit depth, shots
+and noise model, and jobs that finish early (adaptive sampling) can settle to
+their actual cost so the unused budget is refunded. Jobs that are too large are rejected outright (413), clients
+that have spent their budget are told to back off (429), and admitted jobs
+wait in a weighted fair queue so interactive traffic is served ahead of
+long-running batch work.
+"""
+
+import asyncio
+import heapq
+import itertools
+import math
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, Optional
+
+# Noisy simulation samples Pauli errors after every gate, roughly doubling work
+NOISY_COST_FACTOR = 2.0
+
+# Idle client state is pruned after this many admissions
+PRUNE_INTERVAL = 256
+
+# Relative share of the simulator each traffic class receives when contended
+DEFAULT_CLASS_WEIGHTS = {
+    "interactive": 4.0,
+    "batch": 1.0,
+}
+
+
+class AdmissionError(Exception):
+    """Raised when a job is rejected before it reaches the simulator"""
+
+    def __init__(self, status_code: int, detail: str, retry_after: Optional[float] = None):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.retry_after = retry_after
+
+
+def estimate_cost(num_qubits: int, depth: int, shots: int = 1, noise=None, simulated: bool = True) -> float:
+    """Estimate simulator work for a job in abstract cost units
+
+    State-vector simulation touches 2^n amplitudes per gate, so a shot costs
+    depth * 2^n and the job costs that times the number of shots. Jobs that
+    trace a program instead of simulating it (resource estimation) pass
+    simulated=False and pay depth * n.
+    """
+    width = 2 ** num_qubits if simulated else max(1, num_qubits)
+    cost = float(shots) * max(1, depth) * width
+    if noise:
+        cost *= NOISY_COST_FACTOR
+    return cost
+
+
+class TokenBucket:
+    """Per-client budget that refills continuously up to its capacity"""
+
+    def __init__(self, capacity: float, refill_rate: float):
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.refill_rate)
+        self.updated = now
+
+    def is_full(self) -> bool:
+        """True once the bucket has refilled - dropping it then loses nothing"""
+        self._refill()
+        return self.tokens >= self.capacity
+
+    def try_consume(self, amount: float) -> Optional[float]:
+        """Consume `amount` tokens, or return seconds to wait if short"""
+        self._refill()
+        if amount <= self.tokens:
+            self.tokens -= amount
+            return None
+        return (amount - self.tokens) / self.refill_rate
+
+    def credit(self, amount: float):
+        """Return unused tokens, never beyond capacity"""
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+
+class AdmissionTicket:
+    """Handle for an admitted job, yielded by AdmissionController.admit"""
+
+    def __init__(self, controller: "AdmissionController", client_id: str, cost: float):
+        self._controller = controller
+        self.client_id = client_id
+        self.cost = cost
+        self.settled = False
+
+    def settle(self, actual_cost: float):
+        """Refund the difference between the up-front price and `actual_cost`
+
+        Only the first call counts, the refund is clamped to [0, cost], and a
+        non-finite `actual_cost` refunds nothing.
+        """
+        if self.settled:
+            return
+        self.settled = True
+        if not math.isfinite(actual_cost):
+            return
+        refund = self.cost - min(self.cost, max(0.0, actual_cost))
+        if refund > 0:
+            self._controller._refund(self.client_id, refund)
+
+
+class AdmissionController:
+    """Cost-based admission with per-client budgets and weighted fair queuing
+
+    Scheduling uses self-clocked fair queuing: each job gets a virtual finish
+    tag of max(virtual clock, client's last tag) + cost / weight, and free
+    slots are handed to the smallest tag. A client flooding the queue only
+    pushes its own tags further out, so other clients keep their share.
+    """
+
+    def __init__(
+        self,
+        max_job_cost: float = 5_000_000,
+        client_capacity: float = 5_000_000,
+        client_refill_rate: float = 50_000,
+        class_weights: Optional[Dict[str, float]] = None,
+        concurrency: int = 1
+    ):
+        self.max_job_cost = max_job_cost
+        self.client_capacity = client_capacity
+        self.client_refill_rate = client_refill_rate
+        self.class_weights = class_weights or dict(DEFAULT_CLASS_WEIGHTS)
+        self.concurrency = concurrency
+
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._last_finish: Dict[str, float] = {}
+        self._virtual_time = 0.0
+        self._active = 0
+        self._queue = []
+        self._seq = itertools.count()
+        self._admissions = 0
+
+    def _check_budget(self, client_id: str, cost: float):
+        """Reject jobs that exceed the hard limit or the client's budget"""
+        if not math.isfinite(cost) or cost <= 0:
+            raise AdmissionError(400, f"Invalid job cost {cost}")
+
+        # A job larger than a full bucket could never be admitted, so it is
+        # rejected as too large rather than told to retry forever
+        limit = min(self.max_job_cost, self.client_capacity)
+        if cost > limit:
+            raise AdmissionError(
+                413,
+                f"Job cost {cost:.0f} exceeds the per-job limit of {limit:.0f} - "
+                "reduce shots, qubits or circuit depth"
+            )
+
+        bucket = self._buckets.get(client_id)
+        if bucket is None:
+            bucket = TokenBucket(self.client_capacity, self.client_refill_rate)
+            self._buckets[client_id] = bucket
+
+        wait = bucket.try_consume(cost)
+        if wait is not None:
+            raise AdmissionError(
+                429,
+                f"Client budget exhausted - retry in {wait:.1f}s",
+                retry_after=wait
+            )
+
+    def _refund(self, client_id: str, amount: float):
+        bucket = self._buckets.get(client_id)
+        # A pruned bucket was already full, so there is nothing to return
+        if bucket is not None:
+            bucket.credit(amount)
+
+    def _prune(self):
+        """Forget clients whose state has decayed back to the defaults
+
+        A full bucket equals a fresh one, and a finish tag at or behind the
+        virtual clock is superseded by it, so dropping either changes nothing.
+        """
+        for client_id in [c for c, b in self._buckets.items() if b.is_full()]:
+            del self._buckets[client_id]
+        for client_id in [c for c, f in self._last_finish.items() if f <= self._virtual_time]:
+            del self._last_finish[client_id]
+
+    def _dispatch(self):
+        """Hand free slots to the queued jobs with the smallest finish tags"""
+        while self._active < self.concurrency and self._queue:
+            finish, _, waiter = heapq.heappop(self._queue)
+            if waiter.done():
+                # Client went away while queued
+                continue
+            self._active += 1
+            self._virtual_time = finish
+            waiter.set_result(None)
+
+    @asynccontextmanager
+    async def admit(self, client_id: str, cost: float, traffic_class: str = "interactive"):
+        """Admit a job, wait for its fair-share turn, and hold a slot while it runs
+
+        Yields an AdmissionTicket; call ticket.settle(actual_cost) once the
+        job knows it used less than it was priced at.
+        """
+        self._check_budget(client_id, cost)
+
+        self._admissions += 1
+        if self._admissions % PRUNE_INTERVAL == 0:
+            self._prune()
+
+        weight = self.class_weights.get(traffic_class, 1.0)
+        start = max(self._virtual_time, self._last_finish.get(client_id, 0.0))
+        finish = start + cost / weight
+        self._last_finish[client_id] = finish
+
+        waiter = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._queue, (finish, next(self._seq), waiter))
+        self._dispatch()
+
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            # Granted a slot in the same tick we were cancelled - give it back
+            if waiter.done() and not waiter.cancelled():
+                self._active -= 1
+                self._dispatch()
+            raise
+
+        try:
+            yield AdmissionTicket(self, client_id, cost)
+        finally:
+            self._active -= 1
+            self._dispatch()
+
+    def status(self) -> Dict[str, float]:
+        """Snapshot of scheduler state for monitoring"""
+        return {
+            "active": self._active,
+            "queued": sum(1 for _, _, w in self._queue if not w.done()),
+            "virtualTime": self._virtual_time,
+            "clients": len(self._buckets),
+        }
@@ -0,0 +1,343 @@
+"""
+Batch Runner - Headless Experiment Runner
+=========================================
+Runs large offline teleportation / Bell-state studies from a JSON spec file.
+
+Work is spread over a process pool, each finished task is written to its own
+NPZ file as soon as it completes, and a checkpoint file records completed
+tasks so an interrupted run can be resumed with the same command.
+
+Usage:
+    python batch_runner.py spec.json --output results/ --workers 4
+
+With an "adaptive" block, "shots" is the maximum budget per task and sampling
+stops early once the confidence interval converges. Use --workers 0 to run
+tasks in-process (handy for debugging).
+
+Teleport tasks sample the lean TeleportShot operation. Bob's qubit has the
+message preparation undone before it is measured, so bob_measurement is 0 and
+success is True exactly when the message arrived intact.
+
+Spec format:
+    {
+        "experiments": [
+            {
+                "name": "teleport-noise-sweep",
+                "operation": "teleport",
+                "message_states": ["zero", "one", "superposition"],
+                "shots": 1000,
+                "noise": [null, {"depolarizing": 0.01}, [0.01, 0.0, 0.01]],
+                "seeds": [1, 2, 3]
+            },
+            {
+                "name": "bell-baseline",
+                "operation": "bell_state",
+                "shots": 500,
+                "seeds": [42]
+            },
+            {
+                "name": "teleport-adaptive",
+                "operation": "teleport",
+                "message_states": ["zero", "one"],
+                "shots": 20000,
+                "adaptive": {"target_width": 0.02, "confidence": 0.95},
+                "noise": [{"depolarizing": 0.01}, {"depolarizing": 0.05}]
+            }
+        ]
+    }
+"""
+
+import argparse
+import hashlib
+import itertools
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from typing import Any, Dict, List
+
+import numpy as np
+
+OPERATIONS = ("teleport", "bell_state")
+CHECKPOINT_FILE = "checkpoint.json"
+
+# Experiment names become file names, so keep them to a safe character set
+_UNSAFE_NAME_CHARS = re.compile(r"[^A-Za-z0-9._-]")
+
+
+# ============================================================================
+# SPEC HANDLING
+# ============================================================================
+
+def load_spec(path: str) -> Dict[str, Any]:
+    """Load and validate an experiment spec file"""
+    with open(path, 'r') as f:
+        spec = json.load(f)
+
+    experiments = spec.get("experiments")
+    if not experiments:
+        raise ValueError("Spec must contain a non-empty 'experiments' list")
+
+    names = set()
+    for i, exp in enumerate(experiments):
+        name = _UNSAFE_NAME_CHARS.sub("_", str(exp.get("name", f"experiment-{i}"))).lstrip(".")
+        if not name:
+            raise ValueError(f"Experiment {i}: 'name' must contain a letter or digit")
+        if name in names:
+            raise ValueError(f"Duplicate experiment name '{name}' - task files would collide")
+        names.add(name)
+        exp["name"] = name
+
+        if exp.get("operation") not in OPERATIONS:
+            raise ValueError(
+                f"{exp['name']}: 'operation' must be one of {OPERATIONS}"
+            )
+        if int(exp.get("shots", 0)) < 1:
+            raise ValueError(f"{exp['name']}: 'shots' must be a positive integer")
+
+    return spec
+
+
+def _as_list(value, default):
+    """Normalise a scalar-or-list spec field into a list"""
+    if value is None:
+        return list(default)
+    if isinstance(value, list):
+        return value
+    return [value]
+
+
+def expand_tasks(spec: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Expand each experiment into one task per (state, noise, seed) combination"""
+    tasks = []
+    for exp in spec["experiments"]:
+        if exp["operation"] == "teleport":
+            states = _as_list(exp.get("message_states"), ["superposition"])
+        else:
+            states = [""]
+
+        # A bare noise triple is one setting, not a list of settings
+        noise = exp.get("noise")
+        if isinstance(noise, list) and noise and all(
+            isinstance(p, (int, float)) for p in noise
+        ):
+            noise = [noise]
+        noises = _as_list(noise, [None])
+        seeds = _as_list(exp.get("seeds"), [None])
+
+        for i, (state, noise_cfg, seed) in enumerate(
+            itertools.product(states, noises, seeds)
+        ):
+            tasks.append({
+                "task_id": f"{exp['name']}-{i:05d}",
+                "experiment": exp["name"],
+                "operation": exp["operation"],
+                "message_state": state,
+                "shots": int(exp["shots"]),
+                "noise": noise_cfg,
+                "seed": seed,
+                "adaptive": exp.get("adaptive"),
+            })
+    return tasks
+
+
+def spec_fingerprint(tasks: List[Dict[str, Any]]) -> str:
+    """Stable hash of the expanded task list, used to guard resumes"""
+    payload = json.dumps(tasks, sort_keys=True).encode()
+    return hashlib.sha256(payload).hexdigest()
+
+
+# ============================================================================
+# CHECKPOINTING
+# ============================================================================
+
+def load_checkpoint(output_dir: str, fingerprint: str) -> Dict[str, Any]:
+    """Load checkpoint for this spec, or start a fresh one"""
+    path = os.path.join(output_dir, CHECKPOINT_FILE)
+    if not os.path.exists(path):
+        return {"fingerprint": fingerprint, "completed": {}}
+
+    with open(path, 'r') as f:
+        checkpoint = json.load(f)
+
+    if checkpoint.get("fingerprint") != fingerprint:
+        raise ValueError(
+            f"{path} belongs to a different spec - "
+            "use a new output directory or delete the checkpoint"
+        )
+    return checkpoint
+
+
+def save_checkpoint(output_dir: str, checkpoint: Dict[str, Any]):
+    """Atomically write the checkpoint so a crash never leaves it half-written"""
+    path = os.path.join(output_dir, CHECKPOINT_FILE)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(checkpoint, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+# ============================================================================
+# WORKER
+# ============================================================================
+
+def run_task(task: Dict[str, Any]) -> Dict[str, np.ndarray]:
+    """Execute one task in a worker process and return columnar results"""
+    # Imported here so each worker process owns its own Q# interpreter
+    from quantum_utils import run_teleport_shot_records, run_bell_state_shots
+
+    if task["adaptive"]:
+        return run_adaptive_task(task)
+
+    if task["operation"] == "teleport":
+        # TeleportShot has no dumps or messages, so no per-shot events are kept
+        shots = run_teleport_shot_records(
+            message_state=task["message_state"],
+            shots=task["shots"],
+            noise=task["noise"],
+            seed=task["seed"]
+        )
+        return {
+            "message_measurement": np.array([int(s[0]) for s in shots], dtype=np.uint8),
+            "alice_measurement": np.array([int(s[1]) for s in shots], dtype=np.uint8),
+            "bob_measurement": np.array([int(s[2]) for s in shots], dtype=np.uint8),
+            "success": np.array([bool(s[3]) for s in shots], dtype=np.bool_),
+        }
+
+    shots = run_bell_state_shots(
+        shots=task["shots"],
+        noise=task["noise"],
+        seed=task["seed"]
+    )
+    return {
+        "measurement1": np.array([int(s[0]) for s in shots], dtype=np.uint8),
+        "measurement2": np.array([int(s[1]) for s in shots], dtype=np.uint8),
+    }
+
+
+def run_adaptive_task(task: Dict[str, Any]) -> Dict[str, np.ndarray]:
+    """Execute one adaptive-sampling task, returning the estimate as scalars"""
+    from quantum_utils import estimate_teleportation_success, estimate_bell_correlation
+
+    options = dict(
+        target_width=task["adaptive"].get("target_width"),
+        relative_error=task["adaptive"].get("relative_error"),
+        max_shots=task["shots"],
+        confidence=task["adaptive"].get("confidence", 0.95),
+        noise=task["noise"],
+        seed=task["seed"]
+    )
+
+    if task["operation"] == "teleport":
+        result = estimate_teleportation_success(
+            message_state=task["message_state"], **options
+        )
+    else:
+        result = estimate_bell_correlation(**options)
+
+    return {
+        "estimate": np.array(result["estimate"]),
+        "confidence_interval": np.array(result["confidence_interval"]),
+        "shots_used": np.array(result["shots_used"]),
+        "converged": np.array(result["converged"]),
+    }
+
+
+def write_task_result(output_dir: str, task: Dict[str, Any], columns: Dict[str, np.ndarray]) -> str:
+    """Write one task's results to a compressed NPZ file"""
+    filename = f"{task['task_id']}.npz"
+    path = os.path.join(output_dir, filename)
+    tmp_path = path + ".tmp.npz"
+    np.savez_compressed(
+        tmp_path,
+        task=np.array(json.dumps(task, sort_keys=True)),
+        **columns
+    )
+    os.replace(tmp_path, path)
+    return filename
+
+
+# ============================================================================
+# DRIVER
+# ============================================================================
+
+class InlineExecutor:
+    """Runs submitted work immediately in this process (--workers 0)"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def submit(self, fn, *args) -> Future:
+        future = Future()
+        try:
+            future.set_result(fn(*args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+
+def run_batch(spec_path: str, output_dir: str, workers: int = None) -> Dict[str, Any]:
+    """Run every pending task in the spec, resuming from any checkpoint"""
+    spec = load_spec(spec_path)
+    tasks = expand_tasks(spec)
+    fingerprint = spec_fingerprint(tasks)
+
+    os.makedirs(output_dir, exist_ok=True)
+    checkpoint = load_checkpoint(output_dir, fingerprint)
+    pending = [t for t in tasks if t["task_id"] not in checkpoint["completed"]]
+
+    print("=" * 60)
+    print(f"🧪 Batch run: {len(tasks)} tasks, {len(pending)} pending")
+    print("=" * 60)
+
+    failed = {}
+    start = time.time()
+    executor = InlineExecutor() if workers == 0 else ProcessPoolExecutor(max_workers=workers)
+    with executor as pool:
+        futures = {pool.submit(run_task, task): task for task in pending}
+        for future in as_completed(futures):
+            task = futures[future]
+            try:
+                columns = future.result()
+            except Exception as e:
+                failed[task["task_id"]] = str(e)
+                print(f"✗ {task['task_id']} failed: {e}")
+                continue
+
+            filename = write_task_result(output_dir, task, columns)
+            checkpoint["completed"][task["task_id"]] = filename
+            save_checkpoint(output_dir, checkpoint)
+
+            done = len(checkpoint["completed"])
+            print(f"✓ {task['task_id']} ({done}/{len(tasks)})")
+
+    print("=" * 60)
+    print(f"Finished in {time.time() - start:.1f}s - "
+          f"{len(checkpoint['completed'])}/{len(tasks)} complete, {len(failed)} failed")
+    print("=" * 60)
+
+    return {
+        "total": len(tasks),
+        "completed": len(checkpoint["completed"]),
+        "failed": failed,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless batch runner for Q# experiments")
+    parser.add_argument("spec", help="Path to the JSON experiment spec")
+    parser.add_argument("-o", "--output", default="results", help="Output directory for NPZ files")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Worker processes (default: CPU count, 0 = in-process)")
+    args = parser.parse_args(argv)
+
+    summary = run_batch(args.spec, args.output, args.workers)
+    return 0 if not summary["failed"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
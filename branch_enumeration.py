@@ -0,0 +1,242 @@
+"""
+Branch Enumeration - Exact Mid-Circuit Measurement Statistics
+=============================================================
+Enumerates every measurement-outcome branch of the teleportation protocols
+in QuantumEntanglement.qs (TeleportWorkflow and the legacy Teleportation
+operation) with a small state-vector engine.
+
+Each branch records its classical bits, exact probability, the corrections
+Bob applied and Bob's post-correction state, so full protocol statistics come
+from a single evaluation with no sampling variance. Tables are memoized per
+(protocol, input state).
+"""
+
+import copy
+import math
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from gate_matrices import GATES, rotation
+
+# Qubit order in the state tensor
+QUBITS = ("message", "alice", "bob")
+
+# Branches below this probability cannot occur and are pruned
+PROBABILITY_EPSILON = 1e-12
+
+
+# ============================================================================
+# PROTOCOLS
+# ============================================================================
+# Each step is one of:
+#   ("gate", name, qubit)            single-qubit gate
+#   ("cnot", control, target)
+#   ("measure", qubit, bit)          Z measurement, branches on the outcome
+#   ("if", bit, name, qubit)         classically controlled correction
+
+PROTOCOLS = {
+    # Mirrors TeleportWorkflow: Bell pair, Bell measurement, X then Z fix-up
+    "TeleportWorkflow": (
+        ("gate", "H", "alice"),
+        ("cnot", "alice", "bob"),
+        ("cnot", "message", "alice"),
+        ("gate", "H", "message"),
+        ("measure", "message", "message"),
+        ("measure", "alice", "alice"),
+        ("if", "alice", "X", "bob"),
+        ("if", "message", "Z", "bob"),
+    ),
+    # Mirrors the legacy Teleportation operation, including its correction
+    # order (X on the message bit, Z on the alice bit)
+    "Teleportation": (
+        ("gate", "H", "alice"),
+        ("cnot", "alice", "bob"),
+        ("cnot", "message", "alice"),
+        ("gate", "H", "message"),
+        ("measure", "message", "message"),
+        ("if", "message", "X", "bob"),
+        ("measure", "alice", "alice"),
+        ("if", "alice", "Z", "bob"),
+    ),
+}
+
+# The legacy operation never prepares its message qubit
+PROTOCOL_PREPARES_MESSAGE = {
+    "TeleportWorkflow": True,
+    "Teleportation": False,
+}
+
+
+def message_amplitudes(message_state: str) -> Tuple[complex, complex]:
+    """Message qubit amplitudes for a TeleportWorkflow messageState string"""
+    zero = np.array([1, 0], dtype=complex)
+    if message_state == "zero":
+        vec = zero
+    elif message_state == "one":
+        vec = GATES["X"] @ zero
+    elif message_state == "superposition":
+        vec = GATES["H"] @ zero
+    elif message_state == "custom":
+        vec = rotation("Ry", math.pi / 3) @ zero
+    else:
+        # Q# would silently keep |0⟩ - reject instead of returning its table
+        raise ValueError(f"Unknown message state '{message_state}'")
+    return complex(vec[0]), complex(vec[1])
+
+
+# ============================================================================
+# ENGINE
+# ============================================================================
+
+def _apply_gate(state: np.ndarray, gate: np.ndarray, qubit: str) -> np.ndarray:
+    axis = QUBITS.index(qubit)
+    return np.moveaxis(np.tensordot(gate, state, axes=([1], [axis])), 0, axis)
+
+
+def _apply_cnot(state: np.ndarray, control: str, target: str) -> np.ndarray:
+    c, t = QUBITS.index(control), QUBITS.index(target)
+    state = state.copy()
+    index = [slice(None)] * 3
+    index[c] = 1
+    sub_axis = t - (1 if t > c else 0)
+    state[tuple(index)] = np.flip(state[tuple(index)], axis=sub_axis)
+    return state
+
+
+def _project(state: np.ndarray, qubit: str, outcome: int) -> Tuple[np.ndarray, float]:
+    axis = QUBITS.index(qubit)
+    projected = np.zeros_like(state)
+    index = [slice(None)] * 3
+    index[axis] = outcome
+    projected[tuple(index)] = state[tuple(index)]
+    probability = float(np.vdot(projected, projected).real)
+    if probability < PROBABILITY_EPSILON:
+        return projected, 0.0
+    return projected / math.sqrt(probability), probability
+
+
+def _walk(
+    state: np.ndarray,
+    steps: Sequence[tuple],
+    probability: float,
+    bits: Dict[str, int],
+    corrections: List[str],
+    out: List[Dict[str, Any]]
+):
+    """Depth-first walk of the measurement-outcome tree"""
+    for i, step in enumerate(steps):
+        kind = step[0]
+        if kind == "gate":
+            state = _apply_gate(state, GATES[step[1]], step[2])
+        elif kind == "cnot":
+            state = _apply_cnot(state, step[1], step[2])
+        elif kind == "if":
+            if bits[step[1]] == 1:
+                state = _apply_gate(state, GATES[step[2]], step[3])
+                corrections = corrections + [f"{step[2]}({step[3]})"]
+        elif kind == "measure":
+            for outcome in (0, 1):
+                branch, p = _project(state, step[1], outcome)
+                if p == 0.0:
+                    continue
+                _walk(
+                    branch,
+                    steps[i + 1:],
+                    probability * p,
+                    dict(bits, **{step[2]: outcome}),
+                    corrections,
+                    out
+                )
+            return
+    out.append({"state": state, "probability": probability, "bits": bits, "corrections": corrections})
+
+
+def _bob_state(state: np.ndarray, bits: Dict[str, int]) -> np.ndarray:
+    """Bob's pure state once message and alice are collapsed to basis states"""
+    return state[bits["message"], bits["alice"], :]
+
+
+def _bloch_vector(psi: np.ndarray) -> List[float]:
+    a, b = psi
+    return [
+        float(2 * (np.conj(a) * b).real),
+        float(2 * (np.conj(a) * b).imag),
+        float(abs(a) ** 2 - abs(b) ** 2),
+    ]
+
+
+def _complex_pair(z: complex) -> List[float]:
+    return [round(float(z.real), 12), round(float(z.imag), 12)]
+
+
+@lru_cache(maxsize=256)
+def _enumerate_cached(protocol: str, amplitudes: Tuple[complex, complex]) -> Dict[str, Any]:
+    message = np.array(amplitudes, dtype=complex)
+    message = message / np.linalg.norm(message)
+
+    state = np.zeros((2, 2, 2), dtype=complex)
+    state[:, 0, 0] = message
+
+    leaves = []
+    _walk(state, PROTOCOLS[protocol], 1.0, {}, [], leaves)
+
+    branches = []
+    average_fidelity = 0.0
+    for leaf in leaves:
+        bob = _bob_state(leaf["state"], leaf["bits"])
+        fidelity = float(abs(np.vdot(message, bob)) ** 2)
+        average_fidelity += leaf["probability"] * fidelity
+        branches.append({
+            "classicalBits": f"{leaf['bits']['message']}{leaf['bits']['alice']}",
+            "messageMeasurement": leaf["bits"]["message"],
+            "aliceMeasurement": leaf["bits"]["alice"],
+            "probability": leaf["probability"],
+            "corrections": leaf["corrections"],
+            "bobState": {
+                "amplitudes": [_complex_pair(bob[0]), _complex_pair(bob[1])],
+                "blochVector": _bloch_vector(bob),
+                "probabilityOne": float(abs(bob[1]) ** 2),
+            },
+            "fidelity": fidelity,
+        })
+
+    return {
+        "protocol": protocol,
+        "inputState": [_complex_pair(message[0]), _complex_pair(message[1])],
+        "branches": branches,
+        "totalProbability": sum(b["probability"] for b in branches),
+        "averageFidelity": average_fidelity,
+    }
+
+
+def enumerate_branches(
+    protocol: str = "TeleportWorkflow",
+    message_state: str = "superposition",
+    amplitudes: Optional[Sequence[complex]] = None
+) -> Dict[str, Any]:
+    """Exact branch table for a teleportation protocol and input state
+
+    `amplitudes` overrides `message_state` with an arbitrary (alpha, beta)
+    message. The legacy Teleportation operation ignores both, since it never
+    prepares its message qubit.
+    """
+    if protocol not in PROTOCOLS:
+        raise ValueError(f"Unknown protocol '{protocol}' - choose from {sorted(PROTOCOLS)}")
+
+    if not PROTOCOL_PREPARES_MESSAGE[protocol]:
+        key = (1 + 0j, 0j)
+    elif amplitudes is not None:
+        if len(amplitudes) != 2:
+            raise ValueError("amplitudes must be an (alpha, beta) pair")
+        key = (complex(amplitudes[0]), complex(amplitudes[1]))
+        if not all(math.isfinite(part) for a in key for part in (a.real, a.imag)):
+            raise ValueError("amplitudes must be finite")
+        if not any(abs(a) > 0 for a in key):
+            raise ValueError("amplitudes must not both be zero")
+    else:
+        key = message_amplitudes(message_state)
+
+    # Cached tables are shared - hand out copies
+    return copy.deepcopy(_enumerate_cached(protocol, key))
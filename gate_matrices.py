@@ -0,0 +1,42 @@
+"""
+Gate Matrices - Shared Single-Qubit Unitaries
+=============================================
+2x2 matrices for the single-qubit gates used by QuantumEntanglement.qs and
+superposition.qs, shared by the branch enumeration engine and the
+single-qubit pipeline.
+"""
+
+import cmath
+import math
+
+import numpy as np
+
+_SQRT_HALF = 1 / math.sqrt(2)
+
+GATES = {
+    "I": np.eye(2, dtype=complex),
+    "X": np.array([[0, 1], [1, 0]], dtype=complex),
+    "Y": np.array([[0, -1j], [1j, 0]], dtype=complex),
+    "Z": np.array([[1, 0], [0, -1]], dtype=complex),
+    "H": np.array([[1, 1], [1, -1]], dtype=complex) * _SQRT_HALF,
+    "S": np.array([[1, 0], [0, 1j]], dtype=complex),
+    "Sdg": np.array([[1, 0], [0, -1j]], dtype=complex),
+    "T": np.array([[1, 0], [0, cmath.exp(1j * math.pi / 4)]], dtype=complex),
+    "Tdg": np.array([[1, 0], [0, cmath.exp(-1j * math.pi / 4)]], dtype=complex),
+}
+for _gate in GATES.values():
+    _gate.setflags(write=False)
+
+ROTATION_GATES = ("Rx", "Ry", "Rz")
+
+
+def rotation(name: str, theta: float) -> np.ndarray:
+    """Rx, Ry or Rz by `theta`, with Q#'s exp(-i theta/2 P) convention"""
+    c, s = math.cos(theta / 2), math.sin(theta / 2)
+    if name == "Rx":
+        return np.array([[c, -1j * s], [-1j * s, c]], dtype=complex)
+    if name == "Ry":
+        return np.array([[c, -s], [s, c]], dtype=complex)
+    if name == "Rz":
+        return np.array([[cmath.exp(-1j * theta / 2), 0], [0, cmath.exp(1j * theta / 2)]], dtype=complex)
+    raise ValueError(f"Unknown rotation gate '{name}'")
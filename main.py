@@ -4,18 +4,37 @@ FastAPI Backend for Quantum Teleportation Experiment
 REST API server that exposes quantum operations via HTTP endpoints
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, Field
 from typing import Optional, List, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
 import uvicorn
 from quantum_utils import (
+    quantum_ops,
+    MESSAGE_STATES,
     entangle_qubits,
     process_single_qubit,
     create_bell_state,
     perform_q_teleportation,
+    estimate_teleportation_success,
+    estimate_bell_correlation,
     QuantumOperations
 )
+from admission_control import AdmissionController, AdmissionError, estimate_cost
+from resource_estimation import (
+    resource_estimator,
+    ESTIMABLE_OPERATIONS,
+    HARDWARE_PROFILES,
+    DEFAULT_PROFILE,
+    DEFAULT_ERROR_BUDGET,
+    CircuitTooLargeError,
+    validate_circuit
+)
+from branch_enumeration import enumerate_branches
+from single_qubit_pipeline import evaluate_pipeline
 from dataclasses import asdict
 import json
 
@@ -35,6 +54,47 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Admission control - prices every job and schedules fairly across clients
+admission = AdmissionController()
+
+# Budgets are keyed by client address. Only enable this behind a proxy that
+# authenticates callers and sets X-Client-Id itself - otherwise any caller
+# can mint a fresh budget by rotating the header
+TRUST_CLIENT_ID_HEADER = False
+
+# The Q# interpreter is process-global state, so all simulator work runs on a
+# single worker thread while the event loop keeps accepting requests. The
+# interpreter is recreated on that thread, since newer qsharp interpreters
+# cannot be used from any thread other than the one that created them
+quantum_executor = ThreadPoolExecutor(max_workers=1, initializer=quantum_ops.reinitialize)
+
+# (qubits, circuit depth) of each Q# operation, used for cost estimation
+TELEPORT_CIRCUIT = (3, 9)
+BELL_STATE_CIRCUIT = (2, 4)
+SINGLE_QUBIT_CIRCUIT = (1, 2)
+
+# Upper bounds for a single-qubit pipeline call
+MAX_PIPELINE_STATES = 100_000
+MAX_PIPELINE_GATES = 10_000
+MAX_PIPELINE_SHOTS = 10_000_000
+
+# Minimum price for an uncached resource-estimation run (cache hits are free);
+# submitted circuits pay more in proportion to qubits x gates
+RESOURCE_ESTIMATION_COST = 10_000
+
+
+@app.exception_handler(AdmissionError)
+async def admission_error_handler(request: Request, exc: AdmissionError):
+    """Turn admission rejections into 413/429 responses"""
+    headers = {}
+    if exc.retry_after is not None:
+        headers["Retry-After"] = str(max(1, int(exc.retry_after + 0.999)))
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={"detail": exc.detail},
+        headers=headers
+    )
+
 
 # ============================================================================
 # REQUEST/RESPONSE MODELS
@@ -75,6 +135,71 @@ class BellStateResponse(BaseModel):
     explanation: str
 
 
+class AdaptiveSamplingOptions(BaseModel):
+    """Stopping rule and budget for adaptive sampling"""
+    targetWidth: Optional[float] = Field(None, gt=0)
+    relativeError: Optional[float] = Field(None, gt=0)
+    maxShots: int = Field(10000, ge=1)
+    confidence: float = Field(0.95, gt=0, lt=1)
+    noise: Optional[Any] = None
+    seed: Optional[int] = None
+
+
+class AdaptiveTeleportationRequest(BaseModel):
+    """Request body for adaptive teleportation success estimation"""
+    messageState: str = "superposition"
+    sampling: AdaptiveSamplingOptions
+
+
+class AdaptiveEstimateResponse(BaseModel):
+    """Response with the converged estimate and its confidence interval"""
+    success: bool
+    estimate: float
+    confidenceInterval: List[float]
+    intervalWidth: float
+    confidence: float
+    shotsUsed: int
+    batches: int
+    converged: bool
+
+
+class BranchEnumerationRequest(BaseModel):
+    """Request body for exact measurement-branch enumeration"""
+    protocol: str = "TeleportWorkflow"
+    messageState: str = "superposition"
+    amplitudes: Optional[List[List[float]]] = None  # [[re, im], [re, im]]
+
+
+class SingleQubitPipelineRequest(BaseModel):
+    """Gate sequence, measurement basis and input states for one pipeline call"""
+    gates: List[Any]  # "H" or {"gate": "Ry", "angle": 0.5}
+    basis: str = "Z"
+    states: List[Any] = ["|0>"]  # named states or [[re, im], [re, im]]
+    shots: int = Field(0, ge=0, le=MAX_PIPELINE_SHOTS)
+    seed: Optional[int] = None
+
+
+class ResourceEstimateRequest(BaseModel):
+    """Estimate a named Q# operation or a submitted gate-list circuit"""
+    operation: Optional[str] = None
+    circuit: Optional[Dict[str, Any]] = None
+    profile: str = DEFAULT_PROFILE
+    errorBudget: float = Field(DEFAULT_ERROR_BUDGET, gt=0, lt=1)
+    messageState: str = "superposition"
+    state: str = "|0>"
+
+
+class ResourceEstimateResponse(BaseModel):
+    """Logical and physical resource estimates"""
+    success: bool
+    cached: bool
+    key: str
+    profile: str
+    operation: Optional[str]
+    logical: Dict[str, Any]
+    physical: Dict[str, Any]
+
+
 # ============================================================================
 # UTILITY FUNCTIONS
 # ============================================================================
@@ -94,6 +219,35 @@ def convert_to_python_qubit(qubit_req: QubitRequest):
     return qubit
 
 
+def get_client_id(http_request: Request) -> str:
+    """Identify the caller for budgeting - client address unless the header is trusted"""
+    if TRUST_CLIENT_ID_HEADER:
+        client_id = http_request.headers.get("X-Client-Id")
+        if client_id:
+            return client_id
+    return http_request.client.host if http_request.client else "anonymous"
+
+
+async def run_quantum(func, *args, **kwargs):
+    """Run a blocking Q# call on the simulator thread"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(quantum_executor, lambda: func(*args, **kwargs))
+
+
+def build_adaptive_response(result: Dict[str, Any]) -> AdaptiveEstimateResponse:
+    """Convert an adaptive_sampling result into the API response model"""
+    return AdaptiveEstimateResponse(
+        success=True,
+        estimate=result["estimate"],
+        confidenceInterval=result["confidence_interval"],
+        intervalWidth=result["interval_width"],
+        confidence=result["confidence"],
+        shotsUsed=result["shots_used"],
+        batches=result["batches"],
+        converged=result["converged"]
+    )
+
+
 # ============================================================================
 # API ENDPOINTS
 # ============================================================================
@@ -109,158 +263,348 @@ async def root():
             "teleport": "/api/teleport",
             "bell-state": "/api/bell-state",
             "entangle": "/api/entangle",
-            "measure": "/api/measure"
+            "measure": "/api/measure",
+            "adaptive-teleport": "/api/adaptive/teleport",
+            "adaptive-bell-state": "/api/adaptive/bell-state",
+            "admission-status": "/api/admission/status",
+            "resource-estimate": "/api/resources/estimate",
+            "resource-profiles": "/api/resources/profiles",
+            "teleport-branches": "/api/teleport/branches",
+            "single-qubit-pipeline": "/api/single-qubit/pipeline"
         }
     }
 
 
+@app.get("/api/admission/status")
+async def admission_status():
+    """Current scheduler load - active and queued jobs"""
+    return admission.status()
+
+
 @app.post("/api/teleport", response_model=TeleportationResponse)
-async def teleport_quantum_state(request: TeleportationRequest):
+async def teleport_quantum_state(request: TeleportationRequest, http_request: Request):
     """
     Main teleportation endpoint - executes full Q# teleportation workflow
     """
-    try:
-        # Convert request models to Python Qubit objects
-        message_qubit = convert_to_python_qubit(request.messageQubit)
-        alice_qubit = convert_to_python_qubit(request.aliceQubit)
-        bob_qubit = convert_to_python_qubit(request.bobQubit)
+    async with admission.admit(get_client_id(http_request), estimate_cost(*TELEPORT_CIRCUIT)):
+        try:
+            # Convert request models to Python Qubit objects
+            message_qubit = convert_to_python_qubit(request.messageQubit)
+            alice_qubit = convert_to_python_qubit(request.aliceQubit)
+            bob_qubit = convert_to_python_qubit(request.bobQubit)
         
-        # Execute Q# teleportation workflow
-        result = perform_q_teleportation(
-            message_qubit, 
-            alice_qubit, 
-            bob_qubit,
-            message_state=request.messageState
-        )
+            # Execute Q# teleportation workflow
+            result = await run_quantum(
+                perform_q_teleportation,
+                message_qubit, 
+                alice_qubit, 
+                bob_qubit,
+                message_state=request.messageState
+            )
         
-        # Parse Q# results
-        if result and len(result) >= 4:
-            msg_measure = int(result[0])
-            alice_measure = int(result[1])
-            bob_state = str(result[2])
-            teleport_success = bool(result[3])
+            # Parse Q# results
+            if result and len(result) >= 4:
+                msg_measure = int(result[0])
+                alice_measure = int(result[1])
+                bob_state = str(result[2])
+                teleport_success = bool(result[3])
             
-            # Build step-by-step explanation
-            quantum_steps = [
-                {
-                    "phase": "initialization",
-                    "description": f"Message qubit prepared in {request.messageState} state"
-                },
-                {
-                    "phase": "entanglement",
-                    "description": "Bell pair created between Alice and Bob: (|00⟩ + |11⟩)/√2"
-                },
-                {
-                    "phase": "bell_measurement",
-                    "description": f"Alice measured: message={msg_measure}, alice={alice_measure}"
-                },
-                {
-                    "phase": "classical_communication",
-                    "description": f"Classical bits {msg_measure}{alice_measure} sent to Bob"
-                },
-                {
-                    "phase": "correction",
-                    "description": f"Bob applied correction gates based on measurements"
-                },
-                {
-                    "phase": "verification",
-                    "description": f"Bob's final state: {bob_state}"
-                }
-            ]
+                # Build step-by-step explanation
+                quantum_steps = [
+                    {
+                        "phase": "initialization",
+                        "description": f"Message qubit prepared in {request.messageState} state"
+                    },
+                    {
+                        "phase": "entanglement",
+                        "description": "Bell pair created between Alice and Bob: (|00⟩ + |11⟩)/√2"
+                    },
+                    {
+                        "phase": "bell_measurement",
+                        "description": f"Alice measured: message={msg_measure}, alice={alice_measure}"
+                    },
+                    {
+                        "phase": "classical_communication",
+                        "description": f"Classical bits {msg_measure}{alice_measure} sent to Bob"
+                    },
+                    {
+                        "phase": "correction",
+                        "description": f"Bob applied correction gates based on measurements"
+                    },
+                    {
+                        "phase": "verification",
+                        "description": f"Bob's final state: {bob_state}"
+                    }
+                ]
             
-            return TeleportationResponse(
-                success=teleport_success,
-                message="Quantum teleportation completed successfully",
-                results={
-                    "messageMeasurement": msg_measure,
-                    "aliceMeasurement": alice_measure,
-                    "bobFinalState": bob_state,
-                    "classicalBits": f"{msg_measure}{alice_measure}",
-                    "teleportationSuccess": teleport_success
-                },
-                quantumSteps=quantum_steps
-            )
-        else:
+                return TeleportationResponse(
+                    success=teleport_success,
+                    message="Quantum teleportation completed successfully",
+                    results={
+                        "messageMeasurement": msg_measure,
+                        "aliceMeasurement": alice_measure,
+                        "bobFinalState": bob_state,
+                        "classicalBits": f"{msg_measure}{alice_measure}",
+                        "teleportationSuccess": teleport_success
+                    },
+                    quantumSteps=quantum_steps
+                )
+            else:
+                raise HTTPException(
+                    status_code=500, 
+                    detail="Q# teleportation returned unexpected result format"
+                )
+            
+        except Exception as e:
             raise HTTPException(
-                status_code=500, 
-                detail="Q# teleportation returned unexpected result format"
+                status_code=500,
+                detail=f"Quantum operation failed: {str(e)}"
             )
-            
-    except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Quantum operation failed: {str(e)}"
-        )
 
 
 @app.post("/api/bell-state", response_model=BellStateResponse)
-async def create_bell_pair(alice: QubitRequest, bob: QubitRequest):
+async def create_bell_pair(alice: QubitRequest, bob: QubitRequest, http_request: Request):
     """Create entangled Bell pair between two qubits"""
-    try:
-        alice_qubit = convert_to_python_qubit(alice)
-        bob_qubit = convert_to_python_qubit(bob)
+    async with admission.admit(get_client_id(http_request), estimate_cost(*BELL_STATE_CIRCUIT)):
+        try:
+            alice_qubit = convert_to_python_qubit(alice)
+            bob_qubit = convert_to_python_qubit(bob)
         
-        result = create_bell_state(alice_qubit, bob_qubit)
+            result = await run_quantum(create_bell_state, alice_qubit, bob_qubit)
         
-        m1 = int(result[0])
-        m2 = int(result[1])
+            m1 = int(result[0])
+            m2 = int(result[1])
         
-        return BellStateResponse(
-            success=True,
-            measurement1=m1,
-            measurement2=m2,
-            bellState="(|00⟩ + |11⟩)/√2",
-            explanation=f"Qubits measured as {m1} and {m2} (correlated due to entanglement)"
-        )
+            return BellStateResponse(
+                success=True,
+                measurement1=m1,
+                measurement2=m2,
+                bellState="(|00⟩ + |11⟩)/√2",
+                explanation=f"Qubits measured as {m1} and {m2} (correlated due to entanglement)"
+            )
         
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.post("/api/entangle")
-async def entangle_qubits_endpoint(qubit1: QubitRequest, qubit2: QubitRequest):
+async def entangle_qubits_endpoint(qubit1: QubitRequest, qubit2: QubitRequest, http_request: Request):
     """Create entanglement between any two qubits"""
-    try:
-        q1 = convert_to_python_qubit(qubit1)
-        q2 = convert_to_python_qubit(qubit2)
+    async with admission.admit(get_client_id(http_request), estimate_cost(*BELL_STATE_CIRCUIT)):
+        try:
+            q1 = convert_to_python_qubit(qubit1)
+            q2 = convert_to_python_qubit(qubit2)
         
-        result = entangle_qubits(q1, q2)
+            result = await run_quantum(entangle_qubits, q1, q2)
         
-        return {
-            "success": True,
-            "entangled": True,
-            "qubit1": {
-                "id": q1.id,
-                "label": q1.label,
-                "isEntangled": q1.isEntangle,
-                "entangleWith": q1.EntangleWith
-            },
-            "qubit2": {
-                "id": q2.id,
-                "label": q2.label,
-                "isEntangled": q2.isEntangle,
-                "entangleWith": q2.EntangleWith
-            },
-            "result": str(result)
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+            return {
+                "success": True,
+                "entangled": True,
+                "qubit1": {
+                    "id": q1.id,
+                    "label": q1.label,
+                    "isEntangled": q1.isEntangle,
+                    "entangleWith": q1.EntangleWith
+                },
+                "qubit2": {
+                    "id": q2.id,
+                    "label": q2.label,
+                    "isEntangled": q2.isEntangle,
+                    "entangleWith": q2.EntangleWith
+                },
+                "result": str(result)
+            }
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.post("/api/measure")
-async def measure_qubit(qubit: QubitRequest):
+async def measure_qubit(qubit: QubitRequest, http_request: Request):
     """Measure a single qubit - collapses quantum state"""
-    try:
-        q = convert_to_python_qubit(qubit)
-        result = process_single_qubit(q)
+    async with admission.admit(get_client_id(http_request), estimate_cost(*SINGLE_QUBIT_CIRCUIT)):
+        try:
+            q = convert_to_python_qubit(qubit)
+            result = await run_quantum(process_single_qubit, q)
         
-        return {
-            "success": True,
-            "measurement": int(result),
-            "state_after": "|0>" if result == 0 else "|1>"
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+            return {
+                "success": True,
+                "measurement": int(result),
+                "state_after": "|0>" if result == 0 else "|1>"
+            }
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/api/adaptive/teleport", response_model=AdaptiveEstimateResponse)
+async def adaptive_teleport(request: AdaptiveTeleportationRequest, http_request: Request):
+    """Estimate teleportation success rate, stopping once the CI converges"""
+    cost = estimate_cost(*TELEPORT_CIRCUIT, shots=request.sampling.maxShots, noise=request.sampling.noise)
+    async with admission.admit(get_client_id(http_request), cost, "batch") as ticket:
+        try:
+            result = await run_quantum(
+                estimate_teleportation_success,
+                message_state=request.messageState,
+                target_width=request.sampling.targetWidth,
+                relative_error=request.sampling.relativeError,
+                max_shots=request.sampling.maxShots,
+                confidence=request.sampling.confidence,
+                noise=request.sampling.noise,
+                seed=request.sampling.seed
+            )
+            # Refund the budget for shots early stopping did not spend
+            ticket.settle(cost * result["shots_used"] / request.sampling.maxShots)
+            return build_adaptive_response(result)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Quantum operation failed: {str(e)}")
+
+
+@app.post("/api/adaptive/bell-state", response_model=AdaptiveEstimateResponse)
+async def adaptive_bell_state(sampling: AdaptiveSamplingOptions, http_request: Request):
+    """Estimate Bell-pair correlation P(m1 == m2), stopping once the CI converges"""
+    cost = estimate_cost(*BELL_STATE_CIRCUIT, shots=sampling.maxShots, noise=sampling.noise)
+    async with admission.admit(get_client_id(http_request), cost, "batch") as ticket:
+        try:
+            result = await run_quantum(
+                estimate_bell_correlation,
+                target_width=sampling.targetWidth,
+                relative_error=sampling.relativeError,
+                max_shots=sampling.maxShots,
+                confidence=sampling.confidence,
+                noise=sampling.noise,
+                seed=sampling.seed
+            )
+            ticket.settle(cost * result["shots_used"] / sampling.maxShots)
+            return build_adaptive_response(result)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Quantum operation failed: {str(e)}")
+
+
+@app.post("/api/teleport/branches")
+async def teleport_branches(request: BranchEnumerationRequest):
+    """Exact branch table of a teleportation protocol - no sampling involved"""
+    # Not priced by admission control: the work is a fixed 3-qubit walk of at
+    # most 4 branches, memoized per input, and never touches the simulator
+    amplitudes = None
+    if request.amplitudes is not None:
+        if any(len(a) != 2 for a in request.amplitudes):
+            raise HTTPException(status_code=400, detail="amplitudes must be [[re, im], [re, im]]")
+        amplitudes = [complex(re, im) for re, im in request.amplitudes]
+    elif request.messageState not in MESSAGE_STATES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown message state '{request.messageState}' - choose from {list(MESSAGE_STATES)}"
+        )
+
+    try:
+        table = enumerate_branches(request.protocol, request.messageState, amplitudes)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return {"success": True, **table}
+
+
+@app.post("/api/single-qubit/pipeline")
+async def single_qubit_pipeline(request: SingleQubitPipelineRequest, http_request: Request):
+    """Evaluate a single-qubit gate sequence on many input states at once"""
+    if len(request.states) > MAX_PIPELINE_STATES or len(request.gates) > MAX_PIPELINE_GATES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {MAX_PIPELINE_STATES} input states and {MAX_PIPELINE_GATES} gates per request"
+        )
+
+    try:
+        states = []
+        for s in request.states:
+            if isinstance(s, str):
+                states.append(s)
+            elif isinstance(s, list) and all(isinstance(a, list) and len(a) == 2 for a in s):
+                states.append([complex(re, im) for re, im in s])
+            else:
+                raise ValueError(f"Invalid state {s!r} - use a name or [[re, im], [re, im]]")
+
+        # Priced and fair-queued like any job; the numpy work runs on a worker
+        # thread so large batches do not block the event loop
+        cost = estimate_cost(1, len(request.gates) + 2, shots=max(1, len(states)))
+        async with admission.admit(get_client_id(http_request), cost):
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(
+                None,
+                lambda: evaluate_pipeline(
+                    request.gates,
+                    states,
+                    basis=request.basis,
+                    shots=request.shots,
+                    seed=request.seed
+                )
+            )
+    except (ValueError, TypeError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return {"success": True, **result}
+
+
+@app.get("/api/resources/profiles")
+async def resource_profiles():
+    """Hardware profiles and operations available for resource estimation"""
+    return {
+        "profiles": HARDWARE_PROFILES,
+        "defaultProfile": DEFAULT_PROFILE,
+        "operations": ESTIMABLE_OPERATIONS
+    }
+
+
+@app.post("/api/resources/estimate", response_model=ResourceEstimateResponse)
+async def estimate_resources(request: ResourceEstimateRequest, http_request: Request):
+    """Logical counts and physical estimates - memoized per (source hash, profile)"""
+    if (request.operation is None) == (request.circuit is None):
+        raise HTTPException(status_code=400, detail="Provide exactly one of 'operation' or 'circuit'")
+
+    if request.operation is not None:
+        lookup = resource_estimator.cached_operation
+        estimate = resource_estimator.estimate_operation
+        args = dict(
+            operation=request.operation,
+            profile=request.profile,
+            message_state=request.messageState,
+            state=request.state,
+            error_budget=request.errorBudget
+        )
+    else:
+        lookup = resource_estimator.cached_circuit
+        estimate = resource_estimator.estimate_circuit
+        args = dict(
+            circuit=request.circuit,
+            profile=request.profile,
+            error_budget=request.errorBudget
+        )
+
+    try:
+        # Cache hits skip admission and the simulator queue entirely
+        result = lookup(**args)
+    except CircuitTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if result is None:
+        cost = RESOURCE_ESTIMATION_COST
+        if request.circuit is not None:
+            num_qubits, gates = validate_circuit(request.circuit)
+            cost = max(cost, estimate_cost(num_qubits, len(gates), simulated=False))
+
+        async with admission.admit(get_client_id(http_request), cost, "batch"):
+            try:
+                result = await run_quantum(estimate, **args)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            except Exception as e:
+                raise HTTPException(status_code=500, detail=f"Resource estimation failed: {str(e)}")
+
+    return ResourceEstimateResponse(success=True, **result)
 
 
 # ============================================================================
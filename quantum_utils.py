@@ -5,8 +5,64 @@ This module bridges Python and Q# quantum operations.
 """
 
 import qsharp 
+import hashlib
+import inspect
 import os
-from typing import Optional, Tuple, Any
+from typing import Optional, Tuple, Any, List, Dict
+from adaptive_sampling import adaptive_estimate
+
+# Resolve the Q# source next to this module so imports work from any cwd
+# (batch workers and the API server do not share the demo's working dir)
+QS_SOURCE_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), 'QuantumEntanglement.qs'
+)
+
+def _run_accepts_seed() -> bool:
+    """True when qsharp.run takes a seed and varies it per shot
+
+    Newer qsharp runs every shot on a fresh simulator, so a seed set on the
+    interpreter would make every shot of a run identical.
+    """
+    try:
+        return "seed" in inspect.signature(qsharp.run).parameters
+    except (TypeError, ValueError):
+        return False
+
+
+RUN_ACCEPTS_SEED = _run_accepts_seed()
+
+# messageState values understood by TeleportWorkflow / PrepareMessage
+MESSAGE_STATES = ("zero", "one", "superposition", "custom")
+
+
+def _check_message_state(message_state: str):
+    """Reject message states Q# would silently treat as |0⟩"""
+    if message_state not in MESSAGE_STATES:
+        raise ValueError(
+            f"Unknown message state '{message_state}' - choose from {list(MESSAGE_STATES)}"
+        )
+
+
+def _build_noise(noise):
+    """Convert a JSON-friendly noise setting into a qsharp noise model
+
+    Accepts None, a (px, py, pz) Pauli triple, or a dict with one of
+    'depolarizing', 'bit_flip', 'phase_flip' or 'pauli' keys.
+    """
+    if noise is None:
+        return None
+    if isinstance(noise, (list, tuple)):
+        return tuple(float(p) for p in noise)
+    if "depolarizing" in noise:
+        return qsharp.DepolarizingNoise(float(noise["depolarizing"]))
+    if "bit_flip" in noise:
+        return qsharp.BitFlipNoise(float(noise["bit_flip"]))
+    if "phase_flip" in noise:
+        return qsharp.PhaseFlipNoise(float(noise["phase_flip"]))
+    if "pauli" in noise:
+        return tuple(float(p) for p in noise["pauli"])
+    raise ValueError(f"Unsupported noise setting: {noise}")
+
 
 class QuantumOperations:
     """Class to handle Q# quantum operations with automatic error recovery"""
@@ -17,10 +73,19 @@ class QuantumOperations:
         self.qs_code = None
         self._load_qsharp_operations()
     
+    def reinitialize(self):
+        """Start a fresh interpreter on the calling thread and reload operations
+
+        Newer qsharp interpreters can only be used from the thread that
+        created them, so a dedicated simulator thread calls this first.
+        """
+        qsharp.init()
+        self._load_qsharp_operations()
+    
     def _load_qsharp_operations(self):
         """Load Q# operations from QuantumEntanglement.qs"""
         try:
-            with open('QuantumEntanglement.qs', 'r') as f:
+            with open(QS_SOURCE_PATH, 'r') as f:
                 self.qs_code = f.read()
             qsharp.eval(self.qs_code)
             print("✓ Q# operations loaded successfully")
@@ -52,6 +117,67 @@ class QuantumOperations:
             []
         );"""
     
+    def _qubit_info_expr(self, qubit_info: dict) -> str:
+        """Build an inline Q# QubitInfo constructor expression"""
+        return f"""QuantumEntanglement.QubitInfo(
+            "{qubit_info['id']}",
+            "{qubit_info['label']}",
+            "{qubit_info['role']}",
+            {str(qubit_info['isEntangle']).lower()},
+            "{qubit_info['state']}",
+            []
+        )"""
+    
+    def _run_qsharp(
+        self,
+        entry_expr: str,
+        shots: int,
+        noise=None,
+        seed: Optional[int] = None,
+        save_events: bool = True
+    ) -> List[Any]:
+        """Run a Q# entry expression for many shots with optional noise/seed
+
+        Pass save_events=False for entry points with no dumps or messages, so
+        per-shot events are not held in memory.
+        """
+        kwargs = {"save_events": save_events}
+        noise_model = _build_noise(noise)
+        if noise_model is not None:
+            kwargs["noise"] = noise_model
+        
+        # Prefer the per-run seed; fall back to seeding the interpreter on
+        # qsharp versions without one
+        interpreter_seed = seed
+        if seed is not None and RUN_ACCEPTS_SEED:
+            kwargs["seed"] = seed
+            interpreter_seed = None
+        
+        try:
+            qsharp.set_quantum_seed(interpreter_seed)
+            qsharp.set_classical_seed(interpreter_seed)
+            try:
+                shots_out = qsharp.run(entry_expr, shots, **kwargs)
+            except Exception as e:
+                if "NotFound" in str(e) and self.qs_code:
+                    print("⟳ Q# definitions lost, reloading...")
+                    qsharp.init()
+                    qsharp.eval(self.qs_code)
+                    qsharp.set_quantum_seed(interpreter_seed)
+                    qsharp.set_classical_seed(interpreter_seed)
+                    shots_out = qsharp.run(entry_expr, shots, **kwargs)
+                else:
+                    raise
+        finally:
+            # Seeds persist on the shared interpreter - restore randomness so
+            # later runs and _exec_qsharp calls are not reproducible
+            if interpreter_seed is not None:
+                qsharp.set_quantum_seed(None)
+                qsharp.set_classical_seed(None)
+        
+        # save_events wraps each shot in a dict; keep only the return value
+        return [s["result"] if isinstance(s, dict) else s for s in shots_out]
+    
     def _exec_qsharp(self, code: str) -> Any:
         """Execute Q# code with automatic error recovery"""
         try:
@@ -130,6 +256,60 @@ class QuantumOperations:
         
         return result
     
+    def run_teleportation_shots(
+        self,
+        message_qubit,
+        alice_qubit,
+        bob_qubit,
+        message_state: str = "superposition",
+        shots: int = 1,
+        noise=None,
+        seed: Optional[int] = None
+    ) -> List[Any]:
+        """Run the teleportation workflow for many shots in one Q# call"""
+        _check_message_state(message_state)
+        entry_expr = f"""QuantumEntanglement.TeleportWorkflow(
+            {self._qubit_info_expr(self._create_qubit_info_dict(message_qubit))},
+            {self._qubit_info_expr(self._create_qubit_info_dict(alice_qubit))},
+            {self._qubit_info_expr(self._create_qubit_info_dict(bob_qubit))},
+            "{message_state}"
+        )"""
+        return self._run_qsharp(entry_expr, shots, noise, seed)
+    
+    def run_teleport_verify_shots(
+        self,
+        message_state: str = "superposition",
+        shots: int = 1,
+        noise=None,
+        seed: Optional[int] = None
+    ) -> List[bool]:
+        """Teleport and verify Bob's state in the message's own basis"""
+        _check_message_state(message_state)
+        entry_expr = f'QuantumEntanglement.TeleportAndVerify("{message_state}")'
+        return self._run_qsharp(entry_expr, shots, noise, seed, save_events=False)
+    
+    def run_teleport_shot_records(
+        self,
+        message_state: str = "superposition",
+        shots: int = 1,
+        noise=None,
+        seed: Optional[int] = None
+    ) -> List[Any]:
+        """Lean teleport shots: (message bit, alice bit, Bob's result, verified)"""
+        _check_message_state(message_state)
+        entry_expr = f'QuantumEntanglement.TeleportShot("{message_state}")'
+        return self._run_qsharp(entry_expr, shots, noise, seed, save_events=False)
+    
+    def run_bell_state_shots(
+        self,
+        shots: int = 1,
+        noise=None,
+        seed: Optional[int] = None
+    ) -> List[Any]:
+        """Prepare and measure the simple Bell pair for many shots"""
+        entry_expr = "QuantumEntanglement.CreateBellStatesSimple()"
+        return self._run_qsharp(entry_expr, shots, noise, seed)
+    
     def process_two_qubits(self, qubit1, qubit2):
         """Process two Python qubits with Q# - creates entanglement"""
         q1_info = self._create_qubit_info_dict(qubit1)
@@ -186,4 +366,110 @@ def perform_q_teleportation(
         alice_qubit, 
         bob_qubit, 
         message_state
-    )
\ No newline at end of file
+    )
+
+
+def run_teleportation_shots(
+    message_qubit,
+    alice_qubit,
+    bob_qubit,
+    message_state: str = "superposition",
+    shots: int = 1,
+    noise=None,
+    seed: Optional[int] = None
+):
+    """Run teleportation for many shots - returns one result tuple per shot"""
+    return quantum_ops.run_teleportation_shots(
+        message_qubit,
+        alice_qubit,
+        bob_qubit,
+        message_state,
+        shots,
+        noise,
+        seed
+    )
+
+
+def run_teleport_shot_records(
+    message_state: str = "superposition",
+    shots: int = 1,
+    noise=None,
+    seed: Optional[int] = None
+):
+    """Sample the lean TeleportShot operation - no dumps or messages kept"""
+    return quantum_ops.run_teleport_shot_records(message_state, shots, noise, seed)
+
+
+def run_bell_state_shots(shots: int = 1, noise=None, seed: Optional[int] = None):
+    """Sample the simple Bell pair for many shots"""
+    return quantum_ops.run_bell_state_shots(shots, noise, seed)
+
+
+def _batch_seed(seed: Optional[int], batch_index: int) -> Optional[int]:
+    """Derive an independent per-batch seed from (seed, batch_index)
+
+    Hashing keeps streams disjoint across a sweep - with seed + batch_index,
+    batch 1 of seed 1 would replay batch 0 of seed 2.
+    """
+    if seed is None:
+        return None
+    digest = hashlib.sha256(f"{seed}:{batch_index}".encode()).digest()
+    # 48 bits: qsharp offsets the seed by the shot number, so batches' shot
+    # seeds stay disjoint in practice and the sum cannot overflow
+    return int.from_bytes(digest[:6], "little")
+
+
+def estimate_teleportation_success(
+    message_state: str = "superposition",
+    target_width: Optional[float] = None,
+    relative_error: Optional[float] = None,
+    max_shots: int = 10000,
+    confidence: float = 0.95,
+    noise=None,
+    seed: Optional[int] = None
+) -> Dict[str, Any]:
+    """Adaptively estimate the teleportation success rate
+
+    Each shot undoes the message preparation on Bob and checks for |0⟩, so
+    superposition and custom states are verified in their own basis.
+    """
+    _check_message_state(message_state)
+
+    def sample_batch(shots, batch_index):
+        results = quantum_ops.run_teleport_verify_shots(
+            message_state,
+            shots,
+            noise,
+            _batch_seed(seed, batch_index)
+        )
+        return sum(1 for r in results if bool(r))
+
+    return adaptive_estimate(
+        sample_batch,
+        target_width=target_width,
+        relative_error=relative_error,
+        max_shots=max_shots,
+        confidence=confidence
+    )
+
+
+def estimate_bell_correlation(
+    target_width: Optional[float] = None,
+    relative_error: Optional[float] = None,
+    max_shots: int = 10000,
+    confidence: float = 0.95,
+    noise=None,
+    seed: Optional[int] = None
+) -> Dict[str, Any]:
+    """Adaptively estimate P(m1 == m2) for the Bell pair"""
+    def sample_batch(shots, batch_index):
+        results = run_bell_state_shots(shots, noise, _batch_seed(seed, batch_index))
+        return sum(1 for r in results if int(r[0]) == int(r[1]))
+
+    return adaptive_estimate(
+        sample_batch,
+        target_width=target_width,
+        relative_error=relative_error,
+        max_shots=max_shots,
+        confidence=confidence
+    )
@@ -1,4 +1,3 @@
-import os
 from quantum_utils import (
     entangle_qubits,
     process_single_qubit,
@@ -8,9 +7,6 @@ from quantum_utils import (
 from dataclasses import dataclass, field
 from typing import List, Optional
 
-# Set working directory - UPDATE THIS PATH TO YOUR PROJECT FOLDER
-os.chdir(r"D:\Codes\Quantum-Teleportation-Experiment")
-
 @dataclass
 class Qubit:
     """
@@ -0,0 +1,137 @@
+"""
+Adaptive Sampling Tests
+=======================
+Tests the confidence-interval stopping rule without needing Q#.
+
+Usage:
+    python test_adaptive_sampling.py
+"""
+
+import random
+import sys
+
+from adaptive_sampling import adaptive_estimate, wilson_interval
+
+
+def test_wilson_interval_edges():
+    """Test 1: Wilson interval stays inside [0, 1] at p = 0 and p = 1"""
+    low, high = wilson_interval(0, 100)
+    assert low == 0.0 and 0.0 < high < 0.05, (low, high)
+
+    low, high = wilson_interval(100, 100)
+    assert 0.95 < low < 1.0 and high == 1.0, (low, high)
+
+    assert wilson_interval(0, 0) == (0.0, 1.0)
+    print("✓ Wilson interval handles p=0, p=1 and n=0")
+
+
+def test_wilson_interval_narrows():
+    """Test 2: Interval contains p and narrows with more trials"""
+    low_small, high_small = wilson_interval(50, 100)
+    low_big, high_big = wilson_interval(5000, 10000)
+    assert low_small < 0.5 < high_small
+    assert low_big < 0.5 < high_big
+    assert high_big - low_big < high_small - low_small
+    print("✓ Wilson interval narrows with more trials")
+
+
+def test_stops_early_on_easy_config():
+    """Test 3: A deterministic outcome converges long before the budget"""
+    result = adaptive_estimate(lambda shots, i: shots, target_width=0.05, max_shots=100000)
+    assert result["converged"]
+    assert result["estimate"] == 1.0
+    assert result["shots_used"] < 1000, result["shots_used"]
+    assert result["interval_width"] <= 0.05
+    print(f"✓ Converged after {result['shots_used']} shots")
+
+
+def test_budget_exhaustion():
+    """Test 4: An unreachable target spends exactly the budget and reports it"""
+    rng = random.Random(7)
+
+    def coin(shots, batch_index):
+        return sum(rng.random() < 0.5 for _ in range(shots))
+
+    result = adaptive_estimate(coin, target_width=0.001, max_shots=1000)
+    assert not result["converged"]
+    assert result["shots_used"] == 1000
+    low, high = result["confidence_interval"]
+    assert low <= result["estimate"] <= high
+    print("✓ Budget exhaustion stops at max_shots without converging")
+
+
+def test_relative_error_rule():
+    """Test 5: Relative-error stopping and batch indices passed in order"""
+    rng = random.Random(11)
+    seen = []
+
+    def coin(shots, batch_index):
+        seen.append(batch_index)
+        return sum(rng.random() < 0.3 for _ in range(shots))
+
+    result = adaptive_estimate(coin, relative_error=0.1, max_shots=50000)
+    assert result["converged"]
+    half_width = result["interval_width"] / 2
+    assert half_width / result["estimate"] <= 0.1
+    assert seen == list(range(result["batches"]))
+    print("✓ Relative-error rule converges with sequential batch indices")
+
+
+def test_invalid_arguments():
+    """Test 6: Bad stopping parameters are rejected up front"""
+    bad_args = [
+        {},
+        {"target_width": 0.1, "confidence": -0.5},
+        {"target_width": 0.1, "confidence": 1.0},
+        {"target_width": -0.1},
+        {"relative_error": 0.0},
+        {"target_width": 0.1, "max_shots": 0},
+    ]
+    for kwargs in bad_args:
+        try:
+            adaptive_estimate(lambda shots, i: shots, **kwargs)
+        except ValueError:
+            continue
+        raise AssertionError(f"accepted invalid arguments: {kwargs}")
+    print("✓ Invalid arguments raise ValueError")
+
+
+def run_all_tests():
+    """Run all tests and report results"""
+    print("\n" + "="*60)
+    print("🧪 ADAPTIVE SAMPLING TEST SUITE")
+    print("="*60)
+
+    tests = [
+        ("Wilson Edges", test_wilson_interval_edges),
+        ("Wilson Narrowing", test_wilson_interval_narrows),
+        ("Early Stopping", test_stops_early_on_easy_config),
+        ("Budget Exhaustion", test_budget_exhaustion),
+        ("Relative Error", test_relative_error_rule),
+        ("Invalid Arguments", test_invalid_arguments),
+    ]
+
+    results = []
+    for name, test_func in tests:
+        try:
+            test_func()
+            results.append((name, True))
+        except Exception as e:
+            print(f"✗ {name} test failed: {e}")
+            results.append((name, False))
+
+    print("\n" + "="*60)
+    print("TEST SUMMARY")
+    print("="*60)
+    for name, success in results:
+        status = "✓ PASS" if success else "✗ FAIL"
+        print(f"{status:8} | {name}")
+
+    passed = sum(1 for _, success in results if success)
+    print(f"\n{passed}/{len(results)} tests passed")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,203 @@
+"""
+Admission Control Tests
+=======================
+Tests cost pricing, per-client budgets and fair scheduling without Q#.
+
+Usage:
+    python test_admission_control.py
+"""
+
+import asyncio
+import sys
+
+from admission_control import (
+    AdmissionController,
+    AdmissionError,
+    TokenBucket,
+    estimate_cost,
+    PRUNE_INTERVAL,
+)
+
+
+def expect_rejection(controller, client_id, cost, status_code):
+    """Assert that admitting `cost` fails with `status_code`"""
+    async def attempt():
+        async with controller.admit(client_id, cost):
+            pass
+
+    try:
+        asyncio.run(attempt())
+    except AdmissionError as e:
+        assert e.status_code == status_code, (e.status_code, e.detail)
+        return e
+    raise AssertionError(f"cost {cost} was admitted")
+
+
+def test_token_bucket():
+    """Test 1: Bucket consumes, reports wait time, and refills"""
+    bucket = TokenBucket(capacity=100, refill_rate=10)
+    assert bucket.try_consume(60) is None
+    wait = bucket.try_consume(60)
+    assert wait is not None and 1.9 < wait <= 2.0, wait
+
+    # Simulate 10 s passing - refill is capped at capacity
+    bucket.updated -= 10
+    assert bucket.is_full()
+    assert bucket.try_consume(100) is None
+    print("✓ Token bucket consumes, waits and refills")
+
+
+def test_cost_estimate():
+    """Test 2: Cost scales with shots, depth, 2^qubits and noise"""
+    assert estimate_cost(3, 9) == 72
+    assert estimate_cost(3, 9, shots=10) == 720
+    assert estimate_cost(3, 9, shots=10, noise={"depolarizing": 0.1}) == 1440
+    # Traced (not simulated) jobs scale linearly with qubits
+    assert estimate_cost(1024, 10, simulated=False) == 10240
+    print("✓ Cost estimate scales as expected")
+
+
+def test_invalid_cost_rejected():
+    """Test 3: Negative, zero and non-finite costs never reach the queue"""
+    controller = AdmissionController()
+    for cost in (-1e9, 0, float("nan"), float("inf")):
+        expect_rejection(controller, "client", cost, 400)
+    assert controller.status()["virtualTime"] == 0.0
+    assert controller.status()["clients"] == 0
+    print("✓ Invalid costs rejected with 400 without touching state")
+
+
+def test_oversized_job_is_413():
+    """Test 4: Jobs bigger than a full bucket get 413, not an endless 429"""
+    controller = AdmissionController(max_job_cost=5_000_000, client_capacity=2_000_000)
+    error = expect_rejection(controller, "client", 2_880_000, 413)
+    assert error.retry_after is None
+
+    controller = AdmissionController(max_job_cost=1_000, client_capacity=10_000)
+    expect_rejection(controller, "client", 2_000, 413)
+    print("✓ Oversized jobs rejected with 413")
+
+
+def test_budget_exhaustion_is_429():
+    """Test 5: A client over budget gets 429 with a retry hint; others do not"""
+    controller = AdmissionController(client_capacity=100, client_refill_rate=10)
+
+    async def run(client_id):
+        async with controller.admit(client_id, 90):
+            pass
+
+    asyncio.run(run("greedy"))
+    error = expect_rejection(controller, "greedy", 90, 429)
+    assert error.retry_after is not None and error.retry_after > 0
+
+    # Another client's budget is unaffected
+    asyncio.run(run("other"))
+    print("✓ Exhausted budget rejected with 429 and Retry-After")
+
+
+def test_fair_queue_ordering():
+    """Test 6: Interactive jobs overtake a queued batch backlog"""
+    controller = AdmissionController(client_capacity=1e9)
+    order = []
+
+    async def job(client_id, cost, traffic_class):
+        async with controller.admit(client_id, cost, traffic_class):
+            order.append(client_id)
+            await asyncio.sleep(0.001)
+
+    async def run():
+        tasks = [asyncio.create_task(job("batch", 1000, "batch")) for _ in range(4)]
+        await asyncio.sleep(0)
+        tasks += [asyncio.create_task(job("ui", 64, "interactive")) for _ in range(2)]
+        await asyncio.gather(*tasks)
+
+    asyncio.run(run())
+    # The first batch job was already running; both interactive jobs go next
+    assert order == ["batch", "ui", "ui", "batch", "batch", "batch"], order
+    print(f"✓ Fair queue order: {order}")
+
+
+def test_idle_clients_pruned():
+    """Test 7: Client state does not grow without bound"""
+    controller = AdmissionController(client_capacity=1e9, client_refill_rate=1e12)
+
+    async def run():
+        for i in range(PRUNE_INTERVAL * 2):
+            async with controller.admit(f"client-{i}", 10):
+                pass
+
+    asyncio.run(run())
+    assert len(controller._buckets) < PRUNE_INTERVAL, len(controller._buckets)
+    assert len(controller._last_finish) < PRUNE_INTERVAL, len(controller._last_finish)
+    print("✓ Idle client buckets and finish tags pruned")
+
+
+def test_settle_refunds_unused_cost():
+    """Test 8: Settling to the actual cost refunds the unused budget once"""
+    controller = AdmissionController(client_capacity=1000, client_refill_rate=1e-9)
+
+    async def run(settle_to=None):
+        async with controller.admit("adaptive", 800) as ticket:
+            if settle_to is not None:
+                ticket.settle(settle_to)
+                ticket.settle(0)  # second settle is ignored
+            return ticket
+
+    ticket = asyncio.run(run(settle_to=200))
+    assert ticket.settled
+    bucket = controller._buckets["adaptive"]
+    assert abs(bucket.tokens - 800) < 1e-3, bucket.tokens
+
+    # Without the refund this client could not afford a second run
+    asyncio.run(run(settle_to=float("nan")))
+    assert abs(bucket.tokens) < 1e-3, bucket.tokens
+    expect_rejection(controller, "adaptive", 800, 429)
+
+    # Refunds never push a bucket past capacity
+    bucket.tokens = 1000
+    bucket.credit(500)
+    assert bucket.tokens == 1000
+    print("✓ Unused budget refunded on settle, capped at capacity")
+
+
+def run_all_tests():
+    """Run all tests and report results"""
+    print("\n" + "="*60)
+    print("🧪 ADMISSION CONTROL TEST SUITE")
+    print("="*60)
+
+    tests = [
+        ("Token Bucket", test_token_bucket),
+        ("Cost Estimate", test_cost_estimate),
+        ("Invalid Cost", test_invalid_cost_rejected),
+        ("Oversized Job", test_oversized_job_is_413),
+        ("Budget Exhaustion", test_budget_exhaustion_is_429),
+        ("Fair Queue", test_fair_queue_ordering),
+        ("Pruning", test_idle_clients_pruned),
+        ("Settle Refund", test_settle_refunds_unused_cost),
+    ]
+
+    results = []
+    for name, test_func in tests:
+        try:
+            test_func()
+            results.append((name, True))
+        except Exception as e:
+            print(f"✗ {name} test failed: {e}")
+            results.append((name, False))
+
+    print("\n" + "="*60)
+    print("TEST SUMMARY")
+    print("="*60)
+    for name, success in results:
+        status = "✓ PASS" if success else "✗ FAIL"
+        print(f"{status:8} | {name}")
+
+    passed = sum(1 for _, success in results if success)
+    print(f"\n{passed}/{len(results)} tests passed")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,200 @@
+"""
+Batch Runner Tests
+==================
+Tests spec loading, task expansion, checkpoints and resume without Q#.
+
+Usage:
+    python test_batch_runner.py
+"""
+
+import json
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+import batch_runner
+from batch_runner import expand_tasks, load_checkpoint, load_spec, save_checkpoint, spec_fingerprint
+
+SPEC = {
+    "experiments": [
+        {
+            "name": "teleport sweep",
+            "operation": "teleport",
+            "message_states": ["zero", "one"],
+            "shots": 10,
+            "noise": [None, {"depolarizing": 0.01}],
+            "seeds": [1, 2],
+        },
+        {
+            "name": "bell",
+            "operation": "bell_state",
+            "shots": 5,
+            "noise": [0.01, 0.0, 0.01],
+        },
+    ]
+}
+
+
+def write_spec(directory, spec):
+    path = os.path.join(directory, "spec.json")
+    with open(path, "w") as f:
+        json.dump(spec, f)
+    return path
+
+
+def expect_value_error(func, *args):
+    try:
+        func(*args)
+    except ValueError as e:
+        return e
+    raise AssertionError(f"{func.__name__}{args} did not raise ValueError")
+
+
+def test_load_spec_names():
+    """Test 1: Names are sanitised for file names and must stay unique"""
+    with tempfile.TemporaryDirectory() as tmp:
+        spec = load_spec(write_spec(tmp, {"experiments": [
+            {"name": "../../etc/passwd", "operation": "bell_state", "shots": 1},
+            {"name": "a b/c", "operation": "bell_state", "shots": 1},
+        ]}))
+        names = [exp["name"] for exp in spec["experiments"]]
+        assert names == ["_.._etc_passwd", "a_b_c"], names
+
+        # Distinct raw names that sanitise to the same file name collide
+        path = write_spec(tmp, {"experiments": [
+            {"name": "a b", "operation": "bell_state", "shots": 1},
+            {"name": "a/b", "operation": "bell_state", "shots": 1},
+        ]})
+        assert "Duplicate" in str(expect_value_error(load_spec, path))
+
+        for bad in ({"name": "...", "operation": "bell_state", "shots": 1},
+                    {"name": "x", "operation": "nope", "shots": 1},
+                    {"name": "x", "operation": "bell_state", "shots": 0}):
+            expect_value_error(load_spec, write_spec(tmp, {"experiments": [bad]}))
+    print("✓ Names sanitised, duplicates and bad fields rejected")
+
+
+def test_expand_tasks():
+    """Test 2: Noise lists expand per setting; a bare triple is one setting"""
+    tasks = expand_tasks(json.loads(json.dumps(SPEC)))
+    teleport = [t for t in tasks if t["operation"] == "teleport"]
+    bell = [t for t in tasks if t["operation"] == "bell_state"]
+
+    # 2 states x 2 noise settings x 2 seeds
+    assert len(teleport) == 8
+    assert {json.dumps(t["noise"]) for t in teleport} == {"null", '{"depolarizing": 0.01}'}
+
+    assert len(bell) == 1
+    assert bell[0]["noise"] == [0.01, 0.0, 0.01]
+    assert bell[0]["seed"] is None
+    print("✓ Tasks expand per (state, noise, seed)")
+
+
+def test_task_ids_stable():
+    """Test 3: Expanding the same spec twice gives the same ids and fingerprint"""
+    first = expand_tasks(json.loads(json.dumps(SPEC)))
+    second = expand_tasks(json.loads(json.dumps(SPEC)))
+    assert [t["task_id"] for t in first] == [t["task_id"] for t in second]
+    assert len({t["task_id"] for t in first}) == len(first)
+    assert spec_fingerprint(first) == spec_fingerprint(second)
+    print("✓ Task ids and fingerprint are stable")
+
+
+def test_checkpoint_mismatch():
+    """Test 4: A checkpoint from a different spec is refused"""
+    tasks = expand_tasks(json.loads(json.dumps(SPEC)))
+    changed = json.loads(json.dumps(SPEC))
+    changed["experiments"][0]["shots"] = 11
+    other = spec_fingerprint(expand_tasks(changed))
+    assert other != spec_fingerprint(tasks)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        fresh = load_checkpoint(tmp, spec_fingerprint(tasks))
+        assert fresh["completed"] == {}
+        save_checkpoint(tmp, fresh)
+        assert load_checkpoint(tmp, spec_fingerprint(tasks)) == fresh
+        assert "different spec" in str(expect_value_error(load_checkpoint, tmp, other))
+    print("✓ Mismatched checkpoint rejected")
+
+
+def test_resume_skips_completed():
+    """Test 5: Re-running resumes, only executing unfinished tasks"""
+    calls = []
+    failing = {"teleport_sweep-00003"}
+
+    def fake_run_task(task):
+        calls.append(task["task_id"])
+        if task["task_id"] in failing:
+            raise RuntimeError("simulated failure")
+        return {"value": np.arange(task["shots"])}
+
+    original = batch_runner.run_task
+    batch_runner.run_task = fake_run_task
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            spec_path = write_spec(tmp, SPEC)
+            out = os.path.join(tmp, "results")
+
+            summary = batch_runner.run_batch(spec_path, out, workers=0)
+            assert summary["total"] == 9 and summary["completed"] == 8
+            assert list(summary["failed"]) == ["teleport_sweep-00003"]
+            assert len(calls) == 9
+
+            with np.load(os.path.join(out, "bell-00000.npz")) as data:
+                assert data["value"].tolist() == [0, 1, 2, 3, 4]
+                assert json.loads(str(data["task"]))["task_id"] == "bell-00000"
+
+            calls.clear()
+            failing.clear()
+            summary = batch_runner.run_batch(spec_path, out, workers=0)
+            assert calls == ["teleport_sweep-00003"], calls
+            assert summary["completed"] == 9 and not summary["failed"]
+
+            calls.clear()
+            batch_runner.run_batch(spec_path, out, workers=0)
+            assert calls == []
+    finally:
+        batch_runner.run_task = original
+    print("✓ Resume only runs tasks missing from the checkpoint")
+
+
+def run_all_tests():
+    """Run all tests and report results"""
+    print("\n" + "="*60)
+    print("🧪 BATCH RUNNER TEST SUITE")
+    print("="*60)
+
+    tests = [
+        ("Spec Names", test_load_spec_names),
+        ("Task Expansion", test_expand_tasks),
+        ("Stable Task Ids", test_task_ids_stable),
+        ("Checkpoint Mismatch", test_checkpoint_mismatch),
+        ("Resume", test_resume_skips_completed),
+    ]
+
+    results = []
+    for name, test_func in tests:
+        try:
+            test_func()
+            results.append((name, True))
+        except Exception as e:
+            print(f"✗ {name} test failed: {e}")
+            results.append((name, False))
+
+    print("\n" + "="*60)
+    print("TEST SUMMARY")
+    print("="*60)
+    for name, success in results:
+        status = "✓ PASS" if success else "✗ FAIL"
+        print(f"{status:8} | {name}")
+
+    passed = sum(1 for _, success in results if success)
+    print(f"\n{passed}/{len(results)} tests passed")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,145 @@
+"""
+Branch Enumeration Tests
+========================
+Tests the exact teleportation branch tables without needing Q#.
+
+Usage:
+    python test_branch_enumeration.py
+"""
+
+import math
+import sys
+
+from branch_enumeration import enumerate_branches, _enumerate_cached
+
+TOLERANCE = 1e-9
+
+
+def test_workflow_branches_uniform():
+    """Test 1: TeleportWorkflow has four equally likely branches"""
+    for state in ("zero", "one", "superposition", "custom"):
+        table = enumerate_branches("TeleportWorkflow", state)
+        bits = sorted(b["classicalBits"] for b in table["branches"])
+        assert bits == ["00", "01", "10", "11"], bits
+        for branch in table["branches"]:
+            assert abs(branch["probability"] - 0.25) < TOLERANCE
+        assert abs(table["totalProbability"] - 1.0) < TOLERANCE
+    print("✓ Four branches with probability 1/4 for every message state")
+
+
+def test_workflow_teleports_perfectly():
+    """Test 2: Every TeleportWorkflow branch recovers the message exactly"""
+    table = enumerate_branches("TeleportWorkflow", amplitudes=[0.6, 0.8j])
+    for branch in table["branches"]:
+        assert abs(branch["fidelity"] - 1.0) < TOLERANCE
+        assert abs(branch["bobState"]["probabilityOne"] - 0.64) < TOLERANCE
+    assert abs(table["averageFidelity"] - 1.0) < TOLERANCE
+    print("✓ Fidelity 1 on every branch for an arbitrary input")
+
+
+def test_workflow_corrections():
+    """Test 3: Corrections follow the classical bits (X on alice, Z on message)"""
+    expected = {
+        "00": [],
+        "01": ["X(bob)"],
+        "10": ["Z(bob)"],
+        "11": ["X(bob)", "Z(bob)"],
+    }
+    table = enumerate_branches("TeleportWorkflow", "superposition")
+    for branch in table["branches"]:
+        assert branch["corrections"] == expected[branch["classicalBits"]], branch
+    print("✓ Corrections match the classical bits")
+
+
+def test_legacy_swapped_corrections():
+    """Test 4: The legacy operation's swapped corrections halve the fidelity"""
+    table = enumerate_branches("Teleportation")
+    fidelities = {b["classicalBits"]: b["fidelity"] for b in table["branches"]}
+    assert abs(fidelities["00"] - 1.0) < TOLERANCE
+    assert abs(fidelities["01"]) < TOLERANCE
+    assert abs(fidelities["10"]) < TOLERANCE
+    assert abs(table["averageFidelity"] - 0.5) < TOLERANCE
+    print("✓ Legacy Teleportation averages fidelity 0.5")
+
+
+def test_bloch_vector():
+    """Test 5: Bob's Bloch vector matches the |+> input"""
+    table = enumerate_branches("TeleportWorkflow", "superposition")
+    for branch in table["branches"]:
+        x, y, z = branch["bobState"]["blochVector"]
+        assert abs(x - 1.0) < TOLERANCE and abs(y) < TOLERANCE and abs(z) < TOLERANCE
+    print("✓ Bloch vector (1, 0, 0) for a teleported |+>")
+
+
+def test_memoization_returns_copies():
+    """Test 6: Repeat calls hit the cache and cannot corrupt it"""
+    before = _enumerate_cached.cache_info().hits
+    first = enumerate_branches("TeleportWorkflow", "one")
+    first["branches"].clear()
+    second = enumerate_branches("TeleportWorkflow", "one")
+    assert _enumerate_cached.cache_info().hits > before
+    assert len(second["branches"]) == 4
+    print("✓ Memoized tables are shared safely")
+
+
+def test_invalid_inputs():
+    """Test 7: Unknown protocols and states, and bad amplitudes are rejected"""
+    bad_calls = [
+        {"protocol": "Nope"},
+        {"amplitudes": [math.nan, 1]},
+        {"amplitudes": [complex(0, math.inf), 1]},
+        {"amplitudes": [0, 0]},
+        {"amplitudes": [1]},
+        {"message_state": "bogus"},
+        {"message_state": None},
+        {"message_state": ""},
+    ]
+    for kwargs in bad_calls:
+        try:
+            enumerate_branches(**kwargs)
+        except ValueError:
+            continue
+        raise AssertionError(f"accepted invalid input: {kwargs}")
+    print("✓ Invalid inputs raise ValueError")
+
+
+def run_all_tests():
+    """Run all tests and report results"""
+    print("\n" + "="*60)
+    print("🧪 BRANCH ENUMERATION TEST SUITE")
+    print("="*60)
+
+    tests = [
+        ("Uniform Branches", test_workflow_branches_uniform),
+        ("Perfect Teleport", test_workflow_teleports_perfectly),
+        ("Corrections", test_workflow_corrections),
+        ("Legacy Operation", test_legacy_swapped_corrections),
+        ("Bloch Vector", test_bloch_vector),
+        ("Memoization", test_memoization_returns_copies),
+        ("Invalid Inputs", test_invalid_inputs),
+    ]
+
+    results = []
+    for name, test_func in tests:
+        try:
+            test_func()
+            results.append((name, True))
+        except Exception as e:
+            print(f"✗ {name} test failed: {e}")
+            results.append((name, False))
+
+    print("\n" + "="*60)
+    print("TEST SUMMARY")
+    print("="*60)
+    for name, success in results:
+        status = "✓ PASS" if success else "✗ FAIL"
+        print(f"{status:8} | {name}")
+
+    passed = sum(1 for _, success in results if success)
+    print(f"\n{passed}/{len(results)} tests passed")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
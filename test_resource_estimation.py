@@ -0,0 +1,242 @@
+"""
+Resource Estimation Tests
+=========================
+Tests circuit validation, logical counts and the estimate cache without
+running the resource estimator.
+
+Usage:
+    python test_resource_estimation.py
+"""
+
+import math
+import sys
+
+import resource_estimation
+from resource_estimation import (
+    CircuitTooLargeError,
+    MAX_CACHED_ESTIMATES,
+    MAX_CIRCUIT_GATES,
+    MAX_CIRCUIT_QUBITS,
+    ResourceEstimator,
+    _circuit_to_qsharp,
+    _protocol_counts,
+    circuit_logical_counts,
+    operation_entry_expr,
+    validate_circuit,
+)
+
+CIRCUIT = {
+    "qubits": 3,
+    "gates": [
+        {"gate": "H", "qubits": [0]},
+        {"gate": "CNOT", "qubits": [0, 1]},
+        {"gate": "T", "qubits": [2]},
+        {"gate": "Tdg", "qubits": [2]},
+        {"gate": "Rz", "qubits": [2], "angle": 1},
+        {"gate": "CCNOT", "qubits": [0, 1, 2]},
+    ],
+}
+
+
+def expect_rejection(circuit, error=ValueError):
+    try:
+        validate_circuit(circuit)
+    except error:
+        return
+    raise AssertionError(f"accepted circuit: {circuit}")
+
+
+def test_validate_normalises():
+    """Test 1: Valid circuits are normalised (angles become floats)"""
+    num_qubits, gates = validate_circuit(CIRCUIT)
+    assert num_qubits == 3
+    assert gates[4] == {"gate": "Rz", "qubits": [2], "angle": 1.0}
+    assert all(set(g) == {"gate", "qubits"} for i, g in enumerate(gates) if i != 4)
+    print("✓ Circuit normalised")
+
+
+def test_validate_rejects_malformed():
+    """Test 2: Malformed gates, qubit indices and angles raise ValueError"""
+    gate_cases = [
+        "H",
+        ["H", 0],
+        {"gate": "Q", "qubits": [0]},
+        {"gate": ["H"], "qubits": [0]},
+        {"gate": "H", "qubits": [None]},
+        {"gate": "H", "qubits": ["0"]},
+        {"gate": "H", "qubits": [True]},
+        {"gate": "H", "qubits": 0},
+        {"gate": "H", "qubits": [5]},
+        {"gate": "CNOT", "qubits": [1, 1]},
+        {"gate": "Rz", "qubits": [0], "angle": "nan"},
+        {"gate": "Rz", "qubits": [0], "angle": "inf"},
+        {"gate": "Rz", "qubits": [0], "angle": math.nan},
+        {"gate": "Rz", "qubits": [0], "angle": -math.inf},
+        {"gate": "Rz", "qubits": [0], "angle": None},
+    ]
+    for gate in gate_cases:
+        expect_rejection({"qubits": 2, "gates": [gate]})
+
+    for qubits in (0, -1, None, [None], "3", 2.5, True):
+        expect_rejection({"qubits": qubits, "gates": []})
+    expect_rejection({"qubits": 2, "gates": {"gate": "H"}})
+    expect_rejection(["not", "a", "dict"])
+    print("✓ Malformed circuits raise ValueError")
+
+
+def test_validate_size_limits():
+    """Test 3: Oversized circuits raise CircuitTooLargeError (a ValueError)"""
+    assert issubclass(CircuitTooLargeError, ValueError)
+    expect_rejection({"qubits": 10 ** 12, "gates": []}, CircuitTooLargeError)
+    expect_rejection({"qubits": MAX_CIRCUIT_QUBITS + 1, "gates": []}, CircuitTooLargeError)
+    too_many = [{"gate": "H", "qubits": [0]}] * (MAX_CIRCUIT_GATES + 1)
+    expect_rejection({"qubits": 1, "gates": too_many}, CircuitTooLargeError)
+
+    validate_circuit({"qubits": MAX_CIRCUIT_QUBITS, "gates": too_many[:MAX_CIRCUIT_GATES]})
+    print("✓ Qubit and gate limits enforced")
+
+
+def test_logical_counts():
+    """Test 4: Gate counts, depth and T-count of a submitted circuit"""
+    counts = circuit_logical_counts(*validate_circuit(CIRCUIT))
+    assert counts["totalGates"] == 6
+    assert counts["circuitDepth"] == 4
+    assert counts["tCount"] == 2
+    assert counts["gateCounts"]["CCNOT"] == 1
+    assert circuit_logical_counts(2, [])["circuitDepth"] == 0
+    print("✓ Logical counts for a submitted circuit")
+
+
+def test_qsharp_source():
+    """Test 5: Adjoint gates and finite angles compile to valid Q# calls"""
+    source = _circuit_to_qsharp("Circuit_test", *validate_circuit(CIRCUIT))
+    assert "use qs = Qubit[3];" in source
+    assert "Adjoint T(qs[2]);" in source
+    assert "Rz(1.0, qs[2]);" in source
+    assert "CCNOT(qs[0], qs[1], qs[2]);" in source
+    print("✓ Circuit compiled to Q# source")
+
+
+def test_protocol_counts():
+    """Test 6: Teleportation counts from the protocol step lists"""
+    workflow = _protocol_counts("TeleportWorkflow", "superposition")
+    assert workflow["gateCounts"] == {"H": 3, "CNOT": 2, "M": 3, "X": 1, "Z": 1}
+    assert workflow["circuitDepth"] == 7
+    assert workflow["countsSource"] == "protocol_steps"
+
+    # |0> needs no preparation gate
+    assert _protocol_counts("TeleportWorkflow", "zero")["totalGates"] == 9
+
+    # The legacy operation never prepares its message and corrects mid-way
+    legacy = _protocol_counts("Teleportation", "one")
+    assert legacy["gateCounts"]["H"] == 2
+    assert legacy["circuitDepth"] == 8
+    print("✓ Protocol counts and depth")
+
+
+def test_lru_eviction():
+    """Test 7: The estimate cache evicts the least recently used entry"""
+    estimator = ResourceEstimator()
+    for i in range(MAX_CACHED_ESTIMATES):
+        estimator._store((f"hash-{i}", "gate_ns_e3"), {"key": f"hash-{i}"})
+
+    # Touch the oldest entry so the next insert evicts hash-1 instead
+    hit = estimator._lookup(("hash-0", "gate_ns_e3"))
+    assert hit == {"key": "hash-0", "cached": True}
+
+    estimator._store(("new", "gate_ns_e3"), {"key": "new"})
+    assert len(estimator._cache) == MAX_CACHED_ESTIMATES
+    assert estimator._lookup(("hash-1", "gate_ns_e3")) is None
+    assert estimator._lookup(("hash-0", "gate_ns_e3")) is not None
+
+    # Lookups hand out copies
+    hit["key"] = "changed"
+    assert estimator._lookup(("hash-0", "gate_ns_e3"))["key"] == "hash-0"
+    print("✓ LRU eviction and copy-on-lookup")
+
+
+def test_cache_keys():
+    """Test 8: Keys depend on circuit, profile and error budget only"""
+    estimator = ResourceEstimator()
+    _, _, key = estimator._circuit_key(CIRCUIT, "gate_ns_e3", 0.001)
+
+    # Equivalent input (int vs float angle) shares the key
+    same = dict(CIRCUIT, gates=[dict(g) for g in CIRCUIT["gates"]])
+    same["gates"][4]["angle"] = 1.0
+    assert estimator._circuit_key(same, "gate_ns_e3", 0.001)[2] == key
+
+    assert estimator._circuit_key(CIRCUIT, "gate_us_e3", 0.001)[2] != key
+    assert estimator._circuit_key(CIRCUIT, "gate_ns_e3", 0.01)[2] != key
+
+    _, op_key = estimator._operation_key("TeleportWorkflow", "gate_ns_e3", "one", "|0>", 0.001)
+    _, other = estimator._operation_key("TeleportWorkflow", "gate_ns_e3", "custom", "|0>", 0.001)
+    assert op_key != other
+
+    # Nothing is cached, so lookups miss without running the estimator
+    assert estimator.cached_circuit(CIRCUIT) is None
+    print("✓ Cache keys separate circuits, profiles and budgets")
+
+
+def test_invalid_estimate_options():
+    """Test 9: Unknown profiles, budgets, operations and states are rejected"""
+    estimator = ResourceEstimator()
+    bad_calls = [
+        lambda: estimator.cached_circuit(CIRCUIT, profile="nope"),
+        lambda: estimator.cached_circuit(CIRCUIT, error_budget=0),
+        lambda: estimator.cached_circuit(CIRCUIT, error_budget=math.nan),
+        lambda: estimator.cached_operation("Nope"),
+        lambda: operation_entry_expr("TeleportWorkflow", message_state='x"); Evil("'),
+        lambda: operation_entry_expr("ProcessSingleQubit", state="|2>"),
+    ]
+    for call in bad_calls:
+        try:
+            call()
+        except ValueError:
+            continue
+        raise AssertionError("invalid estimate options accepted")
+    assert len(resource_estimation.resource_estimator._cache) == 0
+    print("✓ Invalid options raise ValueError")
+
+
+def run_all_tests():
+    """Run all tests and report results"""
+    print("\n" + "="*60)
+    print("🧪 RESOURCE ESTIMATION TEST SUITE")
+    print("="*60)
+
+    tests = [
+        ("Normalise Circuit", test_validate_normalises),
+        ("Malformed Circuits", test_validate_rejects_malformed),
+        ("Size Limits", test_validate_size_limits),
+        ("Logical Counts", test_logical_counts),
+        ("Q# Source", test_qsharp_source),
+        ("Protocol Counts", test_protocol_counts),
+        ("LRU Eviction", test_lru_eviction),
+        ("Cache Keys", test_cache_keys),
+        ("Invalid Options", test_invalid_estimate_options),
+    ]
+
+    results = []
+    for name, test_func in tests:
+        try:
+            test_func()
+            results.append((name, True))
+        except Exception as e:
+            print(f"✗ {name} test failed: {e}")
+            results.append((name, False))
+
+    print("\n" + "="*60)
+    print("TEST SUMMARY")
+    print("="*60)
+    for name, success in results:
+        status = "✓ PASS" if success else "✗ FAIL"
+        print(f"{status:8} | {name}")
+
+    passed = sum(1 for _, success in results if success)
+    print(f"\n{passed}/{len(results)} tests passed")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,145 @@
+"""
+Single-Qubit Pipeline Tests
+===========================
+Tests cached unitary composition and basis measurements without Q#.
+
+Usage:
+    python test_single_qubit_pipeline.py
+"""
+
+import math
+import sys
+
+import numpy as np
+
+from single_qubit_pipeline import compose_unitary, evaluate_pipeline, sequence_key
+
+
+def probabilities(gates, states, basis="Z"):
+    return np.array(evaluate_pipeline(gates, states, basis)["probabilities"])
+
+
+def test_composed_unitary():
+    """Test 1: H then Y composes to Y @ H and is unitary"""
+    unitary = compose_unitary(sequence_key(["H", "Y"]))
+    h = np.array([[1, 1], [1, -1]]) / math.sqrt(2)
+    y = np.array([[0, -1j], [1j, 0]])
+    assert np.allclose(unitary, y @ h)
+    assert np.allclose(unitary.conj().T @ unitary, np.eye(2))
+    print("✓ Sequence composes right-to-left into a unitary")
+
+
+def test_measurement_bases():
+    """Test 2: Eigenstates give deterministic outcomes in their own basis"""
+    cases = [
+        ("Z", ["|0>", "|1>"]),
+        ("X", ["|+>", "|->"]),
+        ("Y", ["|+i>", "|-i>"]),
+    ]
+    for basis, (plus, minus) in cases:
+        probs = probabilities([], [plus, minus], basis)
+        assert np.allclose(probs, [[1, 0], [0, 1]]), (basis, probs)
+    print("✓ Z, X and Y bases measure their eigenstates deterministically")
+
+
+def test_superposition_sequence():
+    """Test 3: H then Y on |0> lands on |-> (superposition.qs first steps)"""
+    assert np.allclose(probabilities(["H", "Y"], ["|0>"], "X"), [[0, 1]])
+    assert np.allclose(probabilities(["H", "Y"], ["|0>"], "Z"), [[0.5, 0.5]])
+    print("✓ H, Y on |0> gives |-> up to phase")
+
+
+def test_rotations_and_amplitudes():
+    """Test 4: Rotation angles and raw amplitude inputs are honoured"""
+    probs = probabilities([{"gate": "Ry", "angle": math.pi / 3}], ["|0>"])
+    assert np.allclose(probs, [[0.75, 0.25]])
+
+    probs = probabilities([], [[0.6, 0.8j], [3, 4]])
+    assert np.allclose(probs, [[0.36, 0.64], [0.36, 0.64]])
+    print("✓ Rotations and (normalised) amplitude inputs")
+
+
+def test_unitary_cache():
+    """Test 5: The second call with the same sequence and basis is cached"""
+    gates = ["S", "T", {"gate": "Rz", "angle": 0.25}]
+    assert not evaluate_pipeline(gates, ["|0>"], "Y")["cached"]
+    assert evaluate_pipeline(gates, ["|+>"], "Y")["cached"]
+    print("✓ Unitaries cached by sequence key")
+
+
+def test_sampling():
+    """Test 6: Sampled counts add up to shots and are reproducible"""
+    first = evaluate_pipeline(["H"], ["|0>", "|1>", "|+>"], shots=1000, seed=3)["samples"]
+    second = evaluate_pipeline(["H"], ["|0>", "|1>", "|+>"], shots=1000, seed=3)["samples"]
+    assert first == second
+    for zeros, ones in zip(first["zeroCounts"], first["oneCounts"]):
+        assert zeros + ones == 1000
+    assert first["oneCounts"][2] == 0
+    print("✓ Samples are consistent and seeded")
+
+
+def test_invalid_inputs():
+    """Test 7: Malformed gates, states and bases raise ValueError"""
+    bad_calls = [
+        {"gates": [5], "states": ["|0>"]},
+        {"gates": [["H"]], "states": ["|0>"]},
+        {"gates": [{"gate": ["H"]}], "states": ["|0>"]},
+        {"gates": ["Rx"], "states": ["|0>"]},
+        {"gates": [{"gate": "Rx", "angle": math.nan}], "states": ["|0>"]},
+        {"gates": ["Q"], "states": ["|0>"]},
+        {"gates": [], "states": [5]},
+        {"gates": [], "states": [{}]},
+        {"gates": [], "states": [[math.inf, 0]]},
+        {"gates": [], "states": [[0, 0]]},
+        {"gates": [], "states": ["|2>"]},
+        {"gates": [], "states": ["|0>"], "basis": "W"},
+    ]
+    for kwargs in bad_calls:
+        try:
+            evaluate_pipeline(**kwargs)
+        except ValueError:
+            continue
+        raise AssertionError(f"accepted invalid input: {kwargs}")
+    print("✓ Invalid inputs raise ValueError")
+
+
+def run_all_tests():
+    """Run all tests and report results"""
+    print("\n" + "="*60)
+    print("🧪 SINGLE-QUBIT PIPELINE TEST SUITE")
+    print("="*60)
+
+    tests = [
+        ("Composed Unitary", test_composed_unitary),
+        ("Measurement Bases", test_measurement_bases),
+        ("Superposition Sequence", test_superposition_sequence),
+        ("Rotations", test_rotations_and_amplitudes),
+        ("Unitary Cache", test_unitary_cache),
+        ("Sampling", test_sampling),
+        ("Invalid Inputs", test_invalid_inputs),
+    ]
+
+    results = []
+    for name, test_func in tests:
+        try:
+            test_func()
+            results.append((name, True))
+        except Exception as e:
+            print(f"✗ {name} test failed: {e}")
+            results.append((name, False))
+
+    print("\n" + "="*60)
+    print("TEST SUMMARY")
+    print("="*60)
+    for name, success in results:
+        status = "✓ PASS" if success else "✗ FAIL"
+        print(f"{status:8} | {name}")
+
+    passed = sum(1 for _, success in results if success)
+    print(f"\n{passed}/{len(results)} tests passed")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)